@@ -0,0 +1,331 @@
+"""Performance benchmarks for the tutorial apps.
+
+Run all of them with `python bench.py`, or pick some: `python bench.py find`.
+Benchmarks that need a window must run under a display (xvfb-run works).
+"""
+import sys
+import time
+
+BENCHMARKS = {}
+
+def benchmark(fn):
+    """Registers a bench_* function under its short name"""
+    BENCHMARKS[fn.__name__[len("bench_"):]] = fn
+    return fn
+
+def timed(label, fn, *args, repeat=3):
+    """Prints and returns the best wall time of fn(*args) in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<40} {best * 1000:10.1f} ms")
+    return best * 1000, result
+
+# ================= NOTEPAD =================
+
+def make_document(lines=1_000_000):
+    words = ["error", "warning", "info", "request", "response", "user", "timeout", "retry"]
+    return "\n".join(f"{i:07d} {words[i % 8]} {words[(i * 7) % 8]} id={i * 31 % 9973}" for i in range(lines))
+
+@benchmark
+def bench_find():
+    """Find All / Replace All over a 1M-line document"""
+    import notepad
+    text = make_document()
+    print(f"  document: {text.count(chr(10)) + 1:,} lines, {len(text) / 1e6:.1f} MB")
+
+    literal = notepad.compile_pattern("timeout")
+    _, matches = timed("find all (literal)", notepad.find_matches, text, literal)
+    print(f"  {'matches':<40} {len(matches):10,}")
+
+    regex = notepad.compile_pattern(r"id=99\d\d\b", regex=True)
+    _, matches = timed("find all (regex)", notepad.find_matches, text, regex)
+    print(f"  {'matches':<40} {len(matches):10,}")
+
+    _, result = timed("replace all (literal)", notepad.replace_all, text, literal, "TIMEOUT")
+    print(f"  {'replaced':<40} {result[0]:10,}")
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def make_python_source(lines):
+    block = ['def handler(event, retries=3):', '    """Docstring that', '    spans lines"""',
+             '    total = sum(range(10))  # comment', '    return "done", 0x1F', '']
+    return "\n".join(block[i % len(block)] for i in range(lines))
+
+@benchmark
+def bench_highlight():
+    """Per-keystroke highlighting latency as the file grows"""
+    import highlighter
+    source = make_python_source(100_000)
+    timed("lex 100k lines (no Tk)", lambda: [highlighter.lex_python(l, None) for l in source.split("\n")], repeat=1)
+
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("  keystroke latency needs a display, skipped")
+        return
+    for lines in (1_000, 10_000, 100_000, 1_000_000):
+        text = tk.Text(root, width=80, height=40)
+        text.pack()
+        text.insert("1.0", make_python_source(lines))
+        hl = highlighter.Highlighter(text, "python")
+        middle = lines // 2
+        text.see(f"{middle}.0")
+        root.update()
+        while hl.job:
+            hl.process(budget=1.0)
+
+        samples = []
+        for i in range(200):
+            start = time.perf_counter()
+            text.insert(f"{middle}.4", '"' if i % 10 == 0 else "x")
+            hl.process(budget=1.0)
+            root.update_idletasks()
+            samples.append((time.perf_counter() - start) * 1000)
+        print(f"  {lines:>9,} lines: keystroke p50 {percentile(samples, 50):6.2f} ms   p95 {percentile(samples, 95):6.2f} ms")
+        hl.close()
+        text.destroy()
+    root.destroy()
+
+# ================= CALCULATOR =================
+
+@benchmark
+def bench_batch():
+    """Headless calculator throughput over 200k expressions"""
+    import os
+    import calc_engine
+    lines = [f"{i % 997}*{i % 89 + 1}+{i % 13}/7-(2**{i % 40})" for i in range(200_000)]
+    for workers in sorted({0, os.cpu_count() or 1}):
+        ms, _ = timed(f"workers={workers}", lambda: sum(1 for _ in calc_engine.evaluate_lines(lines, workers=workers)),
+                      repeat=1)
+        print(f"  {'lines/s':<40} {len(lines) / ms * 1000:10,.0f}")
+
+# ================= STARTUP =================
+
+STARTUP_PROBE = """
+import sys, time
+start = time.perf_counter()
+import tkinter as tk
+import launcher
+root = tk.Tk()
+ready = time.perf_counter()
+launcher.Launcher(root).open(sys.argv[1])
+root.update()
+print((ready - start) * 1000, (time.perf_counter() - ready) * 1000)
+"""
+
+@benchmark
+def bench_startup():
+    """Cold (fresh interpreter) and warm (resident launcher) start of each tool"""
+    import os
+    import subprocess
+    import launcher
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    for name, (module_name, _) in launcher.APPS.items():
+        code = f"import time; t = time.perf_counter(); import {module_name}; print((time.perf_counter() - t) * 1000)"
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True, text=True)
+        total = (time.perf_counter() - start) * 1000
+        if out.returncode:
+            print(f"  {name:<12} import failed: {out.stderr.strip().splitlines()[-1]}")
+            continue
+        print(f"  {name:<12} cold process {total:7.1f} ms   of which import {float(out.stdout):7.1f} ms")
+
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("  window timings need a display, skipped")
+        return
+    for name in launcher.APPS:
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", STARTUP_PROBE, name], cwd=here, capture_output=True, text=True)
+        cold = (time.perf_counter() - start) * 1000
+        if out.returncode:
+            print(f"  {name:<12} failed: {out.stderr.strip().splitlines()[-1]}")
+            continue
+        tk_ms, window_ms = map(float, out.stdout.split())
+
+        panel = launcher.Launcher(tk.Toplevel(root))
+        panel.open(name)  # First open in this process pays for the import
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            panel.open(name)
+            root.update()
+            samples.append((time.perf_counter() - start) * 1000)
+        for _, top, _ in list(panel.windows):
+            top.destroy()
+        panel.root.destroy()
+        print(f"  {name:<12} cold launch {cold:7.1f} ms (Tk {tk_ms:.0f}, window {window_ms:.0f})"
+              f"   warm window {percentile(samples, 50):6.1f} ms")
+    root.destroy()
+
+# ================= WALLPAPER =================
+
+def make_animation(path, frames=120, size=(640, 360)):
+    from PIL import Image, ImageDraw
+    images = []
+    for i in range(frames):
+        img = Image.new("RGB", size, (i * 2 % 256, 40, 90))
+        draw = ImageDraw.Draw(img)
+        for j in range(12):
+            x = (i * 7 + j * 53) % size[0]
+            draw.ellipse((x, j * 30, x + 60, j * 30 + 60), fill=(255, j * 20, 0))
+        images.append(img)
+    images[0].save(path, save_all=True, append_images=images[1:], duration=33, loop=0)
+
+def play_headless(pipeline, seconds, busy_every=0, busy_ms=0):
+    """Consumes a FramePipeline like the Tk side would; returns (shown, cpu seconds)"""
+    shown = ticks = 0
+    cpu = time.process_time()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        frame, wait = pipeline.take()
+        shown += frame is not None
+        ticks += 1
+        if busy_every and ticks % busy_every == 0:
+            time.sleep(busy_ms / 1000)  # The UI thread stuck in someone else's handler
+        time.sleep(min(wait or 0.03, 0.03))
+    pipeline.stop()
+    return shown, time.process_time() - cpu
+
+@benchmark
+def bench_wallpaper():
+    """CPU per displayed frame of a 30 fps GIF wallpaper scaled to 1920x1080"""
+    import os
+    import tempfile
+    import wallpaper
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "loop.gif")
+        make_animation(path)
+        for label, busy_every, busy_ms in (("idle UI", 0, 0), ("UI busy 200 ms every 10 ticks", 10, 200)):
+            pipeline = wallpaper.FramePipeline(path, (1920, 1080))
+            shown, cpu = play_headless(pipeline, 3.0, busy_every, busy_ms)
+            print(f"  {label:<40} {shown:5} shown {pipeline.decoded:5} scaled {pipeline.skipped:4} skipped "
+                  f"{pipeline.dropped:3} dropped   {cpu / max(shown, 1) * 1000:6.1f} ms CPU/frame")
+
+# ================= ASYNC BRIDGE =================
+
+class TickRoot:
+    """Runs after() callbacks the way mainloop does, for machines without a display"""
+
+    def __init__(self):
+        self.jobs = []
+        self.cancelled = set()
+        self.count = 0
+
+    def after(self, ms, fn, *args):
+        import heapq
+        self.count += 1
+        heapq.heappush(self.jobs, (time.perf_counter() + ms / 1000, self.count, fn, args))
+        return self.count
+
+    def after_cancel(self, job):
+        self.cancelled.add(job)
+
+    def update(self):
+        import heapq
+        while self.jobs and self.jobs[0][0] <= time.perf_counter():
+            _, job, fn, args = heapq.heappop(self.jobs)
+            if job not in self.cancelled:
+                fn(*args)
+
+    def run(self, seconds):
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            self.update()
+            time.sleep(0.0005)
+
+def spin(n):
+    """Pure-Python work standing in for decoding; holds the GIL the whole time"""
+    total = 0
+    for i in range(n):
+        total += i * i % 7
+    return total
+
+@benchmark
+def bench_async():
+    """UI heartbeat lateness while files, subprocesses and decoding run in the background"""
+    import os
+    import tempfile
+    import tk_asyncio
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("  no display: using a stand-in for mainloop that runs after() callbacks")
+        root = TickRoot()
+
+    def run(seconds):
+        if isinstance(root, TickRoot):
+            return root.run(seconds)
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            root.update()
+            time.sleep(0.0005)
+
+    def heartbeat(seconds, start_load):
+        """Lateness (ms) of a 10 ms after() tick over seconds, with start_load() kicked off first"""
+        samples = []
+        def tick(expected):
+            now = time.perf_counter()
+            samples.append((now - expected) * 1000)
+            if len(samples) < seconds * 100:
+                root.after(10, tick, now + 0.010)
+        root.after(10, tick, time.perf_counter() + 0.010)
+        start_load()
+        run(seconds)
+        return samples
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(64 * 1024 * 1024))
+        work = 3_000_000
+        command = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+
+        def blocking_load():
+            def load():
+                import subprocess
+                with open(path, "rb") as f:
+                    f.read()
+                subprocess.run(command)
+                spin(work)
+            root.after(50, load)
+
+        bridge = tk_asyncio.AsyncBridge(root)
+        done = []
+        async def background(cpu):
+            data = await tk_asyncio.read_file(path)
+            await tk_asyncio.run_process(*command)
+            await (tk_asyncio.run_cpu if cpu else tk_asyncio.run_blocking)(spin, work)
+            return len(data)
+
+        rows = [("idle", lambda: None),
+                ("blocking calls on the Tk thread", blocking_load),
+                ("bridge, decoding on a thread", lambda: bridge.submit(background(False), lambda r, e: done.append(e))),
+                ("bridge, decoding in a process", lambda: bridge.submit(background(True), lambda r, e: done.append(e)))]
+        for label, load in rows:
+            samples = heartbeat(2.0, load)
+            print(f"  {label:<40} p50 {percentile(samples, 50):6.1f} ms   p95 {percentile(samples, 95):6.1f} ms"
+                  f"   max {max(samples):7.1f} ms")
+        bridge.close()
+        if any(done):
+            print(f"  background errors: {[e for e in done if e]}")
+    if not isinstance(root, TickRoot):
+        root.destroy()
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            sys.exit(f"Unknown benchmark {name!r}, choose from: {', '.join(BENCHMARKS)}")
+        print(f"{name}: {BENCHMARKS[name].__doc__}")
+        BENCHMARKS[name]()
@@ -1,11 +1,128 @@
 import tkinter as tk
-from tkinter import font as tkfont
+from tkinter import font as tkfont, simpledialog
+import os
+import queue
+import re
+from calc_engine import (evaluate_in_thread, format_display, result_text, IncrementalEvaluator,
+                         DECIMAL_PRECISION, MAX_EXPRESSION_LENGTH, MAX_PRECISION, MODES)
+
+POLL_MS = 20
+
+# ================= HISTORY =================
+
+HISTORY_FILE = os.path.expanduser("~/.calculator/history.tsv")
+MAX_HISTORY = 500
+MAX_STORED_RESULT = 200   # Longer results are recomputed from their expression instead
+REF = re.compile(r"ans|#\d+")
+
+class History:
+    """Past calculations as [mode, expression, text, value] with a memo for repeats.
+
+    text is the exact result (None when too long to be worth making) and
+    value the result itself for entries from this session. Saved as one
+    tab-separated line per entry, appended as they happen and compacted to
+    the last MAX_HISTORY entries when loaded. Decimal mode is stored as
+    "decimal/<precision>" since precision changes the answer. Results that
+    use "ans" or "#n" are saved whatever their length; one too large to
+    write out is read back from its expression, with those references
+    meaning what they did when it was entered.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = path
+        self.entries = []
+        self.memo = {}   # (mode, expression) -> index of the newest entry
+        self.expanded = []   # Per entry, its expression with references spelled out (see expand)
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return
+        for line in lines[-MAX_HISTORY:]:
+            fields = line.split("\t")
+            if len(fields) == 3 and fields[0].split("/")[0] in MODES:
+                self.remember(*fields)
+        if len(lines) > 2 * MAX_HISTORY:
+            try:
+                with open(self.path, "w", encoding="utf-8") as f:
+                    f.writelines(self.line(*e[:3]) for e in self.entries)
+            except OSError:
+                pass
+
+    def remember(self, mode, expression, text, value=None):
+        self.entries.append([mode, expression, text or None, value])
+        if not REF.search(expression):
+            # Answers that depend on earlier ones can't be reused
+            self.memo[(mode, expression)] = len(self.entries) - 1
+
+    def line(self, mode, expression, result):
+        if result and len(result) > MAX_STORED_RESULT and not REF.search(expression):
+            result = ""
+        return f"{mode}\t{expression}\t{result or ''}\n"
+
+    def add(self, mode, expression, text, value):
+        self.remember(mode, expression, text, value)
+        if text is None and REF.search(expression):
+            text = result_text(value)   # Next session "ans" will mean something else, so keep the number
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(self.line(mode, expression, text))
+        except OSError:
+            pass
+
+    def lookup(self, mode, expression):
+        """The earlier entry for this exact calculation, or None"""
+        index = self.memo.get((mode, expression))
+        return None if index is None else self.entries[index]
+
+    def get(self, name, before=None):
+        """The value (or text) that stands in for "ans" or "#n" inside an expression
+        entered after the first `before` entries (by default, a new one)"""
+        if before is None:
+            before = len(self.entries)
+        index = before - 1 if name == "ans" else int(name[1:]) - 1
+        if not 0 <= index < before:
+            return None
+        mode, expression, text, value = self.entries[index]
+        if value is not None:
+            return value
+        return text if text is not None else self.expand(index)
+
+    def expand(self, index):
+        """The entry's expression in brackets with its references replaced by what they
+        meant when it was entered, or None if one of them has nothing to stand for"""
+        # Filled oldest first, so a long chain of "ans" never recurses more than one level
+        while len(self.expanded) <= index:
+            self.expanded.append(self.spell_out(len(self.expanded)))
+        return self.expanded[index]
+
+    def spell_out(self, index):
+        missing = []
+
+        def substitute(match):
+            earlier = self.get(match.group(), before=index)
+            if not isinstance(earlier, str):
+                earlier = None if earlier is None else result_text(earlier)
+            if earlier is None:
+                missing.append(match.group())
+                return ""
+            return f"({earlier})"
+
+        text = f"({REF.sub(substitute, self.entries[index][1])})"
+        return None if missing or len(text) > MAX_EXPRESSION_LENGTH else text
+
+    def refs(self, expression):
+        return {name: self.get(name) for name in REF.findall(expression)}
 
 class RealisticCalculator:
     def __init__(self, root):
         self.root = root
         self.root.title("Calculator")
-        self.root.geometry("350x500")
+        self.root.geometry("600x500")
         self.root.configure(bg="#202020") # Dark background
 
         # --- Styling Constants ---
@@ -23,20 +140,33 @@ class RealisticCalculator:
         # Fonts
         self.DEFAULT_FONT = tkfont.Font(family="Helvetica", size=20, weight="bold")
         self.DISPLAY_FONT = tkfont.Font(family="Helvetica", size=40, weight="bold")
+        self.SMALL_FONT = tkfont.Font(family="Helvetica", size=14, weight="bold")
 
         # --- State ---
         self.expression = ""
         self.input_text = tk.StringVar()
+        self.mode = tk.StringVar(value="float")   # float / decimal / fraction arithmetic
+        self.precision = tk.IntVar(value=DECIMAL_PRECISION)  # Significant digits in decimal mode
+        self.shown = None                         # Result on the display, re-fitted on resize
+        self.results = queue.Queue()              # Filled by the evaluation thread
+        self.pending = None                       # Expression being evaluated, if any
+        self.preview_text = tk.StringVar()
+        self.history = History()
+        self.live = None                          # IncrementalEvaluator for the preview
+        self.mode.trace_add("write", lambda *args: self.update_preview(reset=True))
+        self.precision.trace_add("write", lambda *args: self.update_preview(reset=True))
 
         # --- Layout ---
         self.create_display()
         self.create_buttons()
+        self.create_history()
 
         # Configure Grid Weights so buttons expand evenly when window is resized
         for i in range(6): # 6 rows (0 to 5)
             self.root.grid_rowconfigure(i, weight=1)
         for i in range(4): # 4 columns
             self.root.grid_columnconfigure(i, weight=1)
+        self.root.grid_columnconfigure(4, weight=2) # History panel
 
 
     def create_display(self):
@@ -44,7 +174,7 @@ class RealisticCalculator:
         display_frame = tk.Frame(self.root, bg=self.COLORS['display_bg'])
         display_frame.grid(row=0, column=0, columnspan=4, sticky="nsew", pady=(20, 10))
 
-        input_field = tk.Entry(
+        input_field = self.input_field = tk.Entry(
             display_frame, 
             textvariable=self.input_text, 
             font=self.DISPLAY_FONT, 
@@ -55,6 +185,19 @@ class RealisticCalculator:
             insertbackground="white" # Cursor color
         )
         input_field.pack(fill=tk.BOTH, expand=True, padx=20)
+        input_field.bind("<Configure>", lambda e: self.shown is not None and self.show_value(self.shown))
+
+        # Live result of what has been typed so far
+        tk.Label(display_frame, textvariable=self.preview_text, font=self.DEFAULT_FONT,
+                 bg=self.COLORS['display_bg'], fg=self.COLORS['btn_func'], anchor="e").pack(fill=tk.X, padx=20)
+
+        # Right-click the display to pick the arithmetic mode
+        mode_menu = tk.Menu(self.root, tearoff=0)
+        for mode in MODES:
+            mode_menu.add_radiobutton(label=mode.capitalize(), value=mode, variable=self.mode)
+        mode_menu.add_separator()
+        mode_menu.add_command(label="Decimal precision...", command=self.ask_precision)
+        input_field.bind("<Button-3>", lambda e: mode_menu.tk_popup(e.x_root, e.y_root))
 
 
     def create_buttons(self):
@@ -118,23 +261,150 @@ class RealisticCalculator:
             btn.bind("<Enter>", lambda e, b=btn, c=hover_color: b.config(bg=c))
             btn.bind("<Leave>", lambda e, b=btn, c=bg_color: b.config(bg=c))
 
+        # --- Scientific panel: list functions, hidden until "Sci" is pressed ---
+        sci_buttons = [
+            # (Label, Text inserted)
+            ('sum', 'sum('), ('mean', 'mean('), ('stdev', 'stdev('), ('pctl', 'percentile('),
+            ('dot', 'dot('), ('range', 'range('), ('(', '('), (')', ')'),
+            ('[', '['), (']', ']'), (',', ','), ('xʸ', '**'),
+        ]
+        self.sci_panel = tk.Frame(self.root, bg=self.COLORS['bg'])
+        for i, (label, text) in enumerate(sci_buttons):
+            btn = tk.Button(self.sci_panel, text=label, bg=self.COLORS['btn_func'], fg='black',
+                            font=self.SMALL_FONT, bd=0, relief="flat", activebackground='#d4d4d2',
+                            cursor="hand2", command=lambda t=text: self.on_click(t))
+            btn.grid(row=i // 4, column=i % 4, sticky="nsew", padx=1, pady=1)
+        for i in range(4):
+            self.sci_panel.grid_columnconfigure(i, weight=1)
+
+        self.sci_toggle = tk.Button(self.root, text="Sci ▾", bg=self.COLORS['btn_num'], fg='white',
+                                    font=self.SMALL_FONT, bd=0, relief="flat", command=self.toggle_sci)
+        self.sci_toggle.grid(row=6, column=0, columnspan=4, sticky="nsew", padx=1, pady=1)
+
+    def toggle_sci(self):
+        if self.sci_panel.winfo_manager():
+            self.sci_panel.grid_remove()
+            self.sci_toggle.config(text="Sci ▾")
+        else:
+            self.sci_panel.grid(row=7, column=0, columnspan=4, sticky="nsew")
+            self.sci_toggle.config(text="Sci ▴")
+
+    def create_history(self):
+        panel = tk.Frame(self.root, bg=self.COLORS['bg'])
+        panel.grid(row=0, column=4, rowspan=8, sticky="nsew", padx=(6, 0))
+        tk.Label(panel, text="History", font=self.DEFAULT_FONT, bg=self.COLORS['bg'],
+                 fg=self.COLORS['text']).pack(anchor="w")
+
+        self.history_list = tk.Listbox(panel, bg=self.COLORS['btn_num'], fg=self.COLORS['text'],
+                                       bd=0, highlightthickness=0, activestyle="none", width=28)
+        self.history_list.pack(fill=tk.BOTH, expand=True)
+        for number, entry in enumerate(self.history.entries, 1):
+            self.show_history_entry(number, entry)
+        self.history_list.see(tk.END)
+        # Clicking an entry inserts a reference to its result
+        self.history_list.bind("<<ListboxSelect>>", self.on_history_select)
+
+        tk.Button(panel, text="ans", bg=self.COLORS['btn_func'], fg='black', font=self.DEFAULT_FONT,
+                  bd=0, relief="flat", command=lambda: self.on_click("ans")).pack(fill=tk.X, pady=(1, 0))
+
+    def ask_precision(self):
+        digits = simpledialog.askinteger("Decimal precision", "Significant digits in decimal mode:",
+                                         parent=self.root, initialvalue=self.precision.get(),
+                                         minvalue=1, maxvalue=MAX_PRECISION)
+        if digits:
+            self.precision.set(digits)
+
+    def mode_key(self):
+        mode = self.mode.get()
+        return f"decimal/{self.precision.get()}" if mode == "decimal" else mode
+
+    def display_chars(self):
+        """How many digits fit across the display right now"""
+        width = self.input_field.winfo_width() - 10
+        return max(8, width // self.DISPLAY_FONT.measure("0"))
+
+    def show_value(self, value):
+        self.shown = value
+        self.input_text.set(format_display(value, self.display_chars()))
+
+    def show_history_entry(self, number, entry):
+        mode, expression, text, value = entry
+        if value is not None:
+            shown = format_display(value, 24)
+        else:
+            shown = text if text is not None else "…"
+        line = f"#{number}  {expression} = {shown}"
+        self.history_list.insert(tk.END, line if len(line) <= 60 else line[:59] + "…")
+
+    def on_history_select(self, event):
+        selection = self.history_list.curselection()
+        if selection:
+            self.history_list.selection_clear(0, tk.END)
+            self.on_click(f"#{selection[0] + 1}")
+
+    def update_preview(self, reset=False):
+        if reset or self.live is None:
+            self.live = IncrementalEvaluator(self.mode.get(), refs=self.history, precision=self.precision.get())
+        self.live.update(self.expression)
+        value = self.live.preview()
+        text = "" if value is None else format_display(value, 30)
+        # Nothing to preview when the expression is just a number
+        self.preview_text.set("" if text == self.expression else "= " + text)
 
     def on_click(self, char):
+        self.shown = None
         if char == 'C':
             self.expression = ""
             self.input_text.set("")
+            self.preview_text.set("")
         elif char == '=':
-            try:
-                # Evaluate the expression
-                result = str(eval(self.expression))
-                self.input_text.set(result)
-                self.expression = result
-            except:
-                self.input_text.set("Error")
-                self.expression = ""
+            if self.pending is None and self.expression:
+                self.pending = self.expression
+                source = self.expression
+                known = self.history.lookup(self.mode_key(), self.expression)
+                if known is not None and known[3] is not None:
+                    self.results.put((known[3], None))
+                    self.poll_result()
+                    return
+                if known is not None and known[2] is not None:
+                    source = known[2]   # Saved last session; reading the number back is cheap
+                # Evaluate off the Tk thread so a slow expression can't freeze the window
+                evaluate_in_thread(source, lambda result, error: self.results.put((result, error)),
+                                   mode=self.mode.get(), refs=self.history.refs(source),
+                                   precision=self.precision.get())
+                self.root.after(POLL_MS, self.poll_result)
         else:
             self.expression += str(char)
             self.input_text.set(self.expression)
+            self.update_preview()
+
+    def poll_result(self):
+        try:
+            result, error = self.results.get_nowait()
+        except queue.Empty:
+            self.input_text.set(self.pending + " …")
+            self.root.after(POLL_MS, self.poll_result)
+            return
+        try:
+            if self.expression == self.pending:
+                if error:
+                    self.input_text.set("Error")
+                    self.expression = ""
+                else:
+                    text = result_text(result, MAX_STORED_RESULT)
+                    self.history.add(self.mode_key(), self.expression, text, result)
+                    self.show_history_entry(len(self.history.entries), self.history.entries[-1])
+                    self.history_list.see(tk.END)
+                    # Keep typing from the exact result, or from "ans" when it has too many digits
+                    self.expression = text if text is not None else "ans"
+                    self.show_value(result)
+                self.preview_text.set("")
+                self.live = None   # "ans" now means something else
+            else:
+                # The user kept typing (or cleared) while we were busy; keep their input
+                self.input_text.set(self.expression)
+        finally:
+            self.pending = None   # Even if showing the result fails, '=' must work again
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,279 @@
+"""Local file search: an inverted index over file names kept current by a crawler.
+
+Each file is indexed under the lowercase words of its path below the crawl
+root ("Projects/tax_2024/Report.PDF" -> projects, tax, 2024, report, pdf,
+report.pdf). A query matches a file when every query word is one of its
+words, a prefix of one, or a typo or two away from one (trigram candidates
+checked by edit distance). Matches on the file name itself rank above matches
+on a parent folder.
+
+The Crawler walks the roots on a background thread. After the first pass it
+only stats directories; a directory whose mtime changed (something in it was
+added, removed or renamed) is listed again. Unchanged trees cost one stat per
+folder per pass.
+
+    index = FileIndex()
+    crawler = Crawler(index, [os.path.expanduser("~")])
+    index.search("tax report")       # [(score, path), ...] best first
+"""
+import bisect
+import heapq
+import os
+import re
+import threading
+import time
+
+# --- Index Settings ---
+WORD = re.compile(r"[a-z0-9]+")
+MIN_FUZZY_LENGTH = 3          # Shorter query words only match exactly or by prefix
+FUZZY_THRESHOLD = 0.45        # Trigram similarity that counts as a typo on its own
+MAX_FUZZY_WORDS = 50          # Closest words followed up per query word
+MAX_FILES = 200_000           # The crawler stops adding past this (roughly 100 MB of index)
+
+# --- Crawler Settings ---
+RESCAN_SECONDS = 30
+SKIP_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules", ".cache", ".venv", "venv", "build", "dist"}
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def max_edits(term):
+    """Typos tolerated in a query word: one in a short word, two in a longer one"""
+    return 1 if len(term) <= 5 else 2
+
+def edit_distance(a, b, limit):
+    """Edits (insert, delete, substitute, swap two neighbours) from a to b; limit + 1 once over limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+def path_words(relative):
+    lowered = relative.lower()
+    words = set(WORD.findall(lowered))
+    words.add(os.path.basename(lowered))
+    return words
+
+class FileIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.paths = []           # id -> path, None once the file is gone
+        self.names = []           # id -> lowercase file name, for ranking
+        self.free = []            # ids of removed files, reused first
+        self.postings = {}        # word -> set of ids
+        self.grams = {}           # trigram -> set of words, for fuzzy matches
+        self.sorted_words = []    # For prefix lookups; rebuilt on the first query after a change
+        self.words_changed = False
+        self.count = 0
+
+    # --- Updates (crawler thread) ---
+    def add(self, path, relative):
+        words = path_words(relative)
+        with self.lock:
+            if self.free:
+                file_id = self.free.pop()
+                self.paths[file_id] = path
+                self.names[file_id] = os.path.basename(path).lower()
+            else:
+                file_id = len(self.paths)
+                self.paths.append(path)
+                self.names.append(os.path.basename(path).lower())
+            for word in words:
+                ids = self.postings.get(word)
+                if ids is None:
+                    ids = self.postings[word] = set()
+                    for gram in trigrams(word):
+                        self.grams.setdefault(gram, set()).add(word)
+                    self.words_changed = True
+                ids.add(file_id)
+            self.count += 1
+        return file_id
+
+    def remove(self, file_id, relative):
+        with self.lock:
+            if self.paths[file_id] is None:
+                return
+            for word in path_words(relative):
+                ids = self.postings.get(word)
+                if ids is None:
+                    continue
+                ids.discard(file_id)
+                if not ids:
+                    del self.postings[word]
+                    for gram in trigrams(word):
+                        self.grams[gram].discard(word)
+                    self.words_changed = True
+            self.paths[file_id] = None
+            self.names[file_id] = None
+            self.free.append(file_id)
+            self.count -= 1
+
+    # --- Queries (Tk thread) ---
+    def matches(self, term):
+        """{id: score} of the files some word of which matches term"""
+        if self.words_changed:
+            self.sorted_words = sorted(self.postings)
+            self.words_changed = False
+        scores = {}
+        def credit(word, score):
+            for file_id in self.postings.get(word, ()):
+                if scores.get(file_id, 0) < score:
+                    scores[file_id] = score
+
+        # Exact and prefix matches: a prefix scores by how much of the word it covers
+        start = bisect.bisect_left(self.sorted_words, term)
+        for word in self.sorted_words[start:]:
+            if not word.startswith(term):
+                break
+            credit(word, 1.0 if word == term else 0.5 + 0.4 * len(term) / len(word))
+
+        if len(term) >= MIN_FUZZY_LENGTH:
+            grams = trigrams(term)
+            shared = {}
+            for gram in grams:
+                for word in self.grams.get(gram, ()):
+                    shared[word] = shared.get(word, 0) + 1
+            # Most shared trigrams first, then closest in length
+            close = heapq.nlargest(MAX_FUZZY_WORDS, shared.items(),
+                                   key=lambda item: (item[1], -abs(len(item[0]) - len(term))))
+            # Trigrams alone miss short typos ("reprot" shares 3 of 7 with report), so the
+            # candidates are also checked by edit distance
+            limit = max_edits(term)
+            for word, common in close:
+                similarity = common / (len(grams) + len(trigrams(word)) - common)
+                distance = edit_distance(term, word, limit)
+                if similarity >= FUZZY_THRESHOLD or distance <= limit:
+                    closeness = 1 - distance / max(len(term), len(word)) if distance <= limit else 0
+                    credit(word, 0.5 * max(similarity, closeness))
+        return scores
+
+    def search(self, query, limit=10):
+        """Best files for query as (score, path), highest first"""
+        terms = WORD.findall(query.lower())
+        if not terms:
+            return []
+        with self.lock:
+            total = None
+            for term in sorted(terms, key=len, reverse=True):
+                scores = self.matches(term)
+                if total is None:
+                    total = scores
+                else:
+                    total = {i: s + scores[i] for i, s in total.items() if i in scores}
+                if not total:
+                    return []
+
+            def rank(file_id):
+                name = self.names[file_id]
+                bonus = sum(0.5 for t in terms if t in name)     # Hit in the file name, not just a folder
+                return total[file_id] + bonus - len(self.paths[file_id]) / 10_000  # Then shorter paths
+
+            best = heapq.nlargest(limit, total, key=rank)
+            return [(rank(i), self.paths[i]) for i in best]
+
+class Crawler:
+    """Keeps a FileIndex in step with the files under roots, on a daemon thread"""
+
+    def __init__(self, index, roots, interval=RESCAN_SECONDS):
+        self.index = index
+        self.roots = list(roots)
+        self.interval = interval
+        self.dirs = {}            # dir -> (mtime_ns, {file name: id}, set of subdirs, root)
+        self.wake = threading.Event()
+        self.stopped = False
+        self.passes = 0
+        self.last_pass = 0.0      # Seconds the last full pass took
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped:
+            start = time.perf_counter()
+            for root in list(self.roots):
+                self.sync(root)
+            for folder in [d for d, entry in self.dirs.items() if entry[3] not in self.roots]:
+                self.forget(folder)   # A root was taken off the list
+            self.last_pass = time.perf_counter() - start
+            self.passes += 1
+            self.wake.wait(self.interval)
+            self.wake.clear()
+
+    def sync(self, root):
+        stack = [root]
+        while stack and not self.stopped:
+            folder = stack.pop()
+            try:
+                mtime = os.stat(folder).st_mtime_ns
+            except OSError:
+                self.forget(folder)
+                continue
+            known = self.dirs.get(folder)
+            if known and known[0] == mtime:
+                stack.extend(known[2])   # Nothing added or removed here; look further down
+                continue
+            stack.extend(self.rescan(folder, mtime, root, known))
+
+    def rescan(self, folder, mtime, root, known):
+        files, subdirs = {}, set()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in SKIP_DIRS and not entry.name.startswith("."):
+                                subdirs.add(entry.path)
+                        elif entry.is_file():
+                            files[entry.name] = None
+                    except OSError:
+                        continue
+        except OSError:
+            self.forget(folder)
+            return []
+
+        old_files = known[1] if known else {}
+        for name, file_id in old_files.items():
+            if name in files:
+                files[name] = file_id
+            else:
+                self.index.remove(file_id, os.path.relpath(os.path.join(folder, name), root))
+        for name in files:
+            if files[name] is None and self.index.count < MAX_FILES:
+                path = os.path.join(folder, name)
+                files[name] = self.index.add(path, os.path.relpath(path, root))
+        files = {name: file_id for name, file_id in files.items() if file_id is not None}
+        for gone in (known[2] - subdirs) if known else ():
+            self.forget(gone)
+        self.dirs[folder] = (mtime, files, subdirs, root)
+        return subdirs
+
+    def forget(self, folder):
+        """Drops a folder that went away, and everything that was below it"""
+        known = self.dirs.pop(folder, None)
+        if not known:
+            return
+        for name, file_id in known[1].items():
+            self.index.remove(file_id, os.path.relpath(os.path.join(folder, name), known[3]))
+        for sub in known[2]:
+            self.forget(sub)
+
+    def set_roots(self, roots):
+        self.roots = list(roots)
+        self.wake.set()
+
+    def rescan_now(self):
+        self.wake.set()
+
+    def stop(self):
+        self.stopped = True
+        self.wake.set()
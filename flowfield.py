@@ -0,0 +1,147 @@
+"""Flow-field navigation for desktop agents, with NumPy.
+
+The screen is a grid of CELL-pixel cells. Obstacles (icons, panels) are
+rectangles stamped into a per-cell count, so moving one only touches its old
+and new cells. For each target the field holds, in every cell, the unit
+vector of the next step on a shortest path there. It is built once with a
+vectorized breadth-first wavefront. Any number of agents then steer with one
+array lookup each. Fields are rebuilt lazily on the first lookup after an
+obstacle moved, and at most every RECOMPUTE_MS while something is being
+dragged.
+
+NumPy is optional: available() is False without it and callers keep their
+old movement.
+"""
+import math
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CELL = 24                 # Pixels per grid cell
+RECOMPUTE_MS = 150        # A field older than this is rebuilt once obstacles change
+MAX_FIELDS = 8            # Targets whose fields are kept
+OBSTACLE_MARGIN = 6       # Pixels of clearance kept around obstacles
+# 8 neighbours as (row, col) steps, and their screen-space unit vectors
+STEPS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+def available():
+    return np is not None
+
+def shifted(grid, dr, dc, fill):
+    """grid moved by (dr, dc): out[r, c] = grid[r - dr, c - dc], edges filled"""
+    out = np.full_like(grid, fill)
+    rows, cols = grid.shape
+    out[max(dr, 0):rows + min(dr, 0), max(dc, 0):cols + min(dc, 0)] = \
+        grid[max(-dr, 0):rows + min(-dr, 0), max(-dc, 0):cols + min(-dc, 0)]
+    return out
+
+class FlowField:
+    def __init__(self, width, height, cell=CELL):
+        self.cell = cell
+        self.cols = max(1, math.ceil(width / cell))
+        self.rows = max(1, math.ceil(height / cell))
+        self.blocked = np.zeros((self.rows, self.cols), dtype=np.int16)  # Obstacles covering each cell
+        self.obstacles = {}       # key -> (r0, r1, c0, c1) it was stamped at
+        self.fields = {}          # target cell -> (vectors, distances, version, built at)
+        self.version = 0
+        norms = np.array([math.hypot(dr, dc) for dr, dc in STEPS], dtype=np.float32)
+        self.units = np.array([(dc, dr) for dr, dc in STEPS], dtype=np.float32) / norms[:, None]
+        self.builds = 0
+
+    # --- Obstacles ---
+    def span(self, x0, y0, x1, y1):
+        m = OBSTACLE_MARGIN
+        c0, c1 = int((x0 - m) // self.cell), int(math.ceil((x1 + m) / self.cell))
+        r0, r1 = int((y0 - m) // self.cell), int(math.ceil((y1 + m) / self.cell))
+        return max(r0, 0), min(r1, self.rows), max(c0, 0), min(c1, self.cols)
+
+    def set_obstacle(self, key, x0, y0, x1, y1):
+        span = self.span(x0, y0, x1, y1)
+        if self.obstacles.get(key) == span:
+            return  # Moved within the same cells
+        self.remove_obstacle(key)
+        r0, r1, c0, c1 = span
+        self.blocked[r0:r1, c0:c1] += 1
+        self.obstacles[key] = span
+        self.version += 1
+
+    def remove_obstacle(self, key):
+        span = self.obstacles.pop(key, None)
+        if span:
+            r0, r1, c0, c1 = span
+            self.blocked[r0:r1, c0:c1] -= 1
+            self.version += 1
+
+    # --- Fields ---
+    def cell_of(self, x, y):
+        return (min(max(int(y // self.cell), 0), self.rows - 1),
+                min(max(int(x // self.cell), 0), self.cols - 1))
+
+    def center(self, cell):
+        return ((cell[1] + 0.5) * self.cell, (cell[0] + 0.5) * self.cell)
+
+    def build(self, target):
+        """Breadth-first distances from target over free cells, then each cell's best step"""
+        free = self.blocked == 0
+        dist = np.full((self.rows, self.cols), np.inf, dtype=np.float32)
+        dist[target] = 0
+        seen = ~free
+        seen[target] = True
+        frontier = np.zeros_like(free)
+        frontier[target] = True
+        step = 0
+        while frontier.any():
+            step += 1
+            grown = np.zeros_like(frontier)
+            for dr, dc in STEPS:
+                grown |= shifted(frontier, dr, dc, False)
+            grown &= ~seen
+            dist[grown] = step
+            seen |= grown
+            frontier = grown
+
+        # Each cell points at its closest neighbour; blocked cells too, so agents walk out of them
+        around = np.stack([shifted(dist, -dr, -dc, np.inf) for dr, dc in STEPS])
+        best = around.argmin(axis=0)
+        improves = np.take_along_axis(around, best[None], axis=0)[0] < dist
+        vectors = self.units[best] * improves[..., None]
+        self.builds += 1
+        return vectors, dist
+
+    def field(self, target):
+        cached = self.fields.get(target)
+        now = time.perf_counter()
+        if cached and (cached[2] == self.version or now - cached[3] < RECOMPUTE_MS / 1000):
+            return cached
+        vectors, dist = self.build(target)
+        if len(self.fields) >= MAX_FIELDS and target not in self.fields:
+            self.fields.pop(next(iter(self.fields)))
+        self.fields[target] = cached = (vectors, dist, self.version, now)
+        return cached
+
+    def direction(self, target, x, y):
+        """Unit (dx, dy) to walk from (x, y) towards the target cell, or None if it can't be reached"""
+        vectors, dist, _, _ = self.field(target)
+        cell = self.cell_of(x, y)
+        dx, dy = vectors[cell]
+        if dx == 0 and dy == 0:
+            if cell == target:
+                return 0.0, 0.0
+            if np.isinf(dist[cell]) and not self.blocked[cell]:
+                return None  # Walled off from the target
+            # Deep inside an obstacle: head straight for the target
+            tx, ty = self.center(target)
+            length = math.hypot(tx - x, ty - y) or 1.0
+            return (tx - x) / length, (ty - y) / length
+        return float(dx), float(dy)
+
+    def random_target(self, rng=random):
+        rows, cols = np.nonzero(self.blocked == 0)
+        if not len(rows):
+            return None
+        i = rng.randrange(len(rows))
+        return int(rows[i]), int(cols[i])
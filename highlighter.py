@@ -0,0 +1,313 @@
+import heapq
+import os
+import re
+import time
+
+# ================= LEXERS =================
+# A lexer takes one line and the state the previous line ended in, and returns
+# ([(tag, start_col, end_col), ...], end_state). States must be comparable with ==
+# so re-lexing can stop as soon as a line ends in the same state as before.
+
+PY_KEYWORDS = {
+    "False", "None", "True", "and", "as", "assert", "async", "await", "break", "class",
+    "continue", "def", "del", "elif", "else", "except", "finally", "for", "from", "global",
+    "if", "import", "in", "is", "lambda", "nonlocal", "not", "or", "pass", "raise",
+    "return", "try", "while", "with", "yield", "match", "case",
+}
+PY_BUILTINS = {
+    "print", "len", "range", "str", "int", "float", "list", "dict", "set", "tuple", "open",
+    "super", "self", "isinstance", "enumerate", "zip", "min", "max", "sum", "sorted", "type",
+}
+PY_TOKEN = re.compile(r"""
+    (?P<comment>\#.*)
+  | (?P<triple>(?:[rRbBuUfF]{1,2})?(?:'''|\"\"\"))
+  | (?P<string>(?:[rRbBuUfF]{1,2})?(?:'(?:\\.|[^'\\])*'?|"(?:\\.|[^"\\])*"?))
+  | (?P<number>\b(?:0[xXoObB][\da-fA-F_]+|\d[\d_]*\.?[\d_]*(?:[eE][+-]?\d+)?j?)\b)
+  | (?P<decorator>@[\w.]+)
+  | (?P<name>[A-Za-z_]\w*)
+""", re.VERBOSE)
+
+def lex_python(line, state):
+    """State is None, or the triple quote delimiter of a string left open"""
+    tokens = []
+    pos = 0
+    if state:
+        end = line.find(state)
+        if end == -1:
+            return [("string", 0, len(line))], state
+        tokens.append(("string", 0, end + 3))
+        pos = end + 3
+
+    prev_name = None
+    while True:
+        m = PY_TOKEN.search(line, pos)
+        if not m:
+            return tokens, None
+        kind = m.lastgroup
+        start, pos = m.span()
+        if kind == "triple":
+            delim = m.group()[-3:]
+            end = line.find(delim, pos)
+            if end == -1:
+                tokens.append(("string", start, len(line)))
+                return tokens, delim
+            tokens.append(("string", start, end + 3))
+            pos = end + 3
+        elif kind == "name":
+            word = m.group()
+            if prev_name in ("def", "class"):
+                tokens.append(("definition", start, pos))
+            elif word in PY_KEYWORDS:
+                tokens.append(("keyword", start, pos))
+            elif word in PY_BUILTINS:
+                tokens.append(("builtin", start, pos))
+            prev_name = word
+            continue
+        else:
+            tokens.append((kind, start, pos))
+        prev_name = None
+
+JSON_TOKEN = re.compile(r"""
+    (?P<key>"(?:\\.|[^"\\])*"(?=\s*:))
+  | (?P<string>"(?:\\.|[^"\\])*"?)
+  | (?P<number>-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b)
+  | (?P<keyword>\b(?:true|false|null)\b)
+""", re.VERBOSE)
+
+def lex_json(line, state):
+    """JSON strings cannot span lines, so there is no state to carry"""
+    return [(m.lastgroup, m.start(), m.end()) for m in JSON_TOKEN.finditer(line)], None
+
+LOG_TOKEN = re.compile(r"""
+    (?P<timestamp>\b\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d(?:[.,]\d+)?(?:Z|[+-]\d\d:?\d\d)?)
+  | (?P<error>\b(?:ERROR|CRITICAL|FATAL|Traceback)\b)
+  | (?P<warning>\bWARN(?:ING)?\b)
+  | (?P<info>\bINFO\b)
+  | (?P<debug>\b(?:DEBUG|TRACE)\b)
+  | (?P<string>"[^"]*"|'[^']*')
+""", re.VERBOSE)
+
+def lex_log(line, state):
+    return [(m.lastgroup, m.start(), m.end()) for m in LOG_TOKEN.finditer(line)], None
+
+LEXERS = {"python": lex_python, "json": lex_json, "log": lex_log}
+EXTENSIONS = {".py": "python", ".pyw": "python", ".json": "json", ".log": "log"}
+
+TAG_STYLES = {
+    "comment": {"foreground": "#6a9955"},
+    "string": {"foreground": "#a31515"},
+    "number": {"foreground": "#098658"},
+    "keyword": {"foreground": "#0000ff"},
+    "builtin": {"foreground": "#795e26"},
+    "definition": {"foreground": "#267f99"},
+    "decorator": {"foreground": "#af00db"},
+    "key": {"foreground": "#0451a5"},
+    "timestamp": {"foreground": "#808080"},
+    "error": {"foreground": "#ffffff", "background": "#d32f2f"},
+    "warning": {"foreground": "#000000", "background": "#ffb300"},
+    "info": {"foreground": "#1565c0"},
+    "debug": {"foreground": "#9e9e9e"},
+}
+
+def language_for(path):
+    if not path:
+        return None
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+# ================= HIGHLIGHTER =================
+
+UNKNOWN = object()      # Start state of a line that was never lexed
+SLICE_SECONDS = 0.008   # Work done per idle callback before yielding to Tk
+FETCH_LINES = 500       # Lines fetched from Tk in one call when lexing a run
+
+class Highlighter:
+    """Incremental syntax highlighting for a Text widget.
+
+    Every line has a recorded start state. An edit only re-lexes the lines it
+    touched, and carries on to the next line only while the end state differs
+    from what was recorded before, so typing costs the same in a 100-line and
+    a 1M-line file. Lines are lexed lazily down to the bottom of the view, and
+    tags are only applied to lines on screen (marked with the "hl_done" tag).
+
+    Insert/delete/replace calls are seen by renaming the widget's Tcl command
+    and putting a Python proxy in its place, the same way idlelib does.
+    """
+    def __init__(self, text, language):
+        self.text = text
+        self.lexer = LEXERS[language]
+        self.orig = text._w + "_orig"
+        text.tk.call("rename", text._w, self.orig)
+        text.tk.createcommand(text._w, self.dispatch)
+
+        for tag, style in TAG_STYLES.items():
+            text.tag_config(tag, **style)
+        text.tag_raise("sel")
+
+        self.states = []        # states[i] = lexer state at the start of line i (0-based)
+        self.pending = []       # Heap of lines that must be re-lexed and checked for convergence
+        self.stale_from = 0     # Lines from here on were never lexed at all
+        self.job = None
+        self.reset()
+
+    def close(self):
+        """Puts the widget's own Tcl command back"""
+        if self.job:
+            self.text.after_cancel(self.job)
+            self.job = None
+        self.text.tk.deletecommand(self.text._w)
+        self.text.tk.call("rename", self.orig, self.text._w)
+        for tag in list(TAG_STYLES) + ["hl_done"]:
+            self.text.tag_remove(tag, "1.0", "end")
+
+    def call(self, *args):
+        return self.text.tk.call(self.orig, *args)
+
+    def line_count(self):
+        return int(str(self.call("index", "end-1c")).split(".")[0])
+
+    def line_of(self, index):
+        return int(str(self.call("index", index)).split(".")[0]) - 1
+
+    def reset(self):
+        """Forgets every state, used when an edit's extent is unknown (undo/redo)"""
+        self.states = [None] + [UNKNOWN] * (self.line_count() - 1)
+        self.pending = []
+        self.stale_from = 0
+        self.call("tag", "remove", "hl_done", "1.0", "end")
+        self.schedule()
+
+    # --- Edits ---
+
+    def dispatch(self, cmd, *args):
+        """Stands in for the widget command, watching the calls that change text"""
+        if cmd == "insert":
+            line = min(self.line_of(args[0]), self.line_count() - 1)
+            result = self.call(cmd, *args)
+            self.on_edit(line, 0, sum(chars.count("\n") for chars in args[1::2]))
+        elif cmd in ("delete", "replace"):
+            first = self.line_of(args[0])
+            last = self.line_of(args[1] if len(args) > 1 else f"{args[0]} +1c")
+            last = min(last, self.line_count() - 1)
+            result = self.call(cmd, *args)
+            added = sum(chars.count("\n") for chars in args[2::2]) if cmd == "replace" else 0
+            self.on_edit(first, max(0, last - first), added)
+        elif cmd == "edit" and args and args[0] in ("undo", "redo"):
+            result = self.call(cmd, *args)
+            self.reset()
+        else:
+            return self.call(cmd, *args)
+        return result
+
+    def on_edit(self, line, removed, added):
+        """Lines line..line+removed were replaced by lines line..line+added"""
+        delta = added - removed
+        if removed or added:
+            self.states[line + 1:line + 1 + removed] = [UNKNOWN] * added
+        if len(self.states) != self.line_count():
+            self.reset()  # Lost track (a multi-range delete, say), start over
+            return
+
+        if delta:
+            self.pending = [p + delta if p > line + removed else min(p, line) for p in self.pending]
+            heapq.heapify(self.pending)
+            if self.stale_from > line + removed:
+                self.stale_from += delta
+            elif self.stale_from > line:
+                self.stale_from = line + 1
+
+        if line < self.stale_from:
+            heapq.heappush(self.pending, line)
+        self.call("tag", "remove", "hl_done", f"{line + 1}.0", f"{line + added + 1}.0 lineend +1c")
+        self.schedule()
+
+    # --- Lexing and Painting ---
+
+    def schedule(self):
+        if not self.job:
+            self.job = self.text.after_idle(self.process)
+
+    def visible_lines(self):
+        top = self.line_of("@0,0")
+        bottom = self.line_of(f"@0,{self.text.winfo_height()}")
+        return top, bottom
+
+    def process(self, budget=SLICE_SECONDS):
+        """Lexes what the view needs and paints it, yielding to Tk after `budget` seconds"""
+        self.job = None
+        deadline = time.perf_counter() + budget
+        top, bottom = self.visible_lines()
+        painted = {}    # line -> tokens, applied in one batch below
+        count = len(self.states)
+
+        while time.perf_counter() < deadline:
+            while self.pending and self.pending[0] >= self.stale_from:
+                heapq.heappop(self.pending)  # The sequential run will reach these anyway
+            if self.pending:
+                line = heapq.heappop(self.pending)
+                tokens, end = self.lexer(self.get_lines(line, 1)[0], self.states[line])
+                if line + 1 < count and self.states[line + 1] != end:
+                    self.states[line + 1] = end
+                    if line + 1 < self.stale_from:
+                        heapq.heappush(self.pending, line + 1)
+                self.collect(line, tokens, top, bottom, painted)
+            elif self.stale_from <= bottom and self.stale_from < count:
+                # Never-lexed run: fetch many lines in one Tk call
+                first = self.stale_from
+                lines = self.get_lines(first, min(FETCH_LINES, bottom + 1 - first))
+                state = self.states[first]
+                for offset, text in enumerate(lines):
+                    tokens, state = self.lexer(text, state)
+                    if first + offset + 1 < count:
+                        self.states[first + offset + 1] = state
+                    self.collect(first + offset, tokens, top, bottom, painted)
+                self.stale_from = first + len(lines)
+            else:
+                self.repaint_visible(top, bottom, painted)
+                self.paint(painted)
+                return
+
+        self.paint(painted)
+        self.job = self.text.after(1, self.process)
+
+    def get_lines(self, first, count):
+        return str(self.call("get", f"{first + 1}.0", f"{first + count}.0 lineend")).split("\n")
+
+    def collect(self, line, tokens, top, bottom, painted):
+        if top <= line <= bottom:
+            painted[line] = tokens
+        else:
+            # Tags off screen may be stale now, repaint when scrolled into view
+            self.call("tag", "remove", "hl_done", f"{line + 1}.0", f"{line + 1}.0 lineend +1c")
+
+    def repaint_visible(self, top, bottom, painted):
+        """Lines on screen without current tags, e.g. after scrolling"""
+        missing = [line for line in range(top, min(bottom + 1, len(self.states)))
+                   if line not in painted and "hl_done" not in self.text.tag_names(f"{line + 1}.0")]
+        if missing:
+            lines = self.get_lines(missing[0], missing[-1] - missing[0] + 1)
+            for line in missing:
+                painted[line] = self.lexer(lines[line - missing[0]], self.states[line])[0]
+
+    def paint(self, painted):
+        """One tag remove and one tag add per tag, each covering every run of repainted lines"""
+        if not painted:
+            return
+        lines = sorted(painted)
+        runs = []
+        for line in lines:
+            if runs and runs[-1][1] == line - 1:
+                runs[-1][1] = line
+            else:
+                runs.append([line, line])
+        spans = [index for first, last in runs for index in (f"{first + 1}.0", f"{last + 1}.0 lineend")]
+        for tag in TAG_STYLES:
+            self.call("tag", "remove", tag, *spans)   # Tk takes any number of ranges per call
+
+        ranges = {}
+        for line in lines:
+            for tag, start, end in painted[line]:
+                ranges.setdefault(tag, []).extend((f"{line + 1}.{start}", f"{line + 1}.{end}"))
+        for tag, indexes in ranges.items():
+            self.call("tag", "add", tag, *indexes)
+        self.call("tag", "add", "hl_done",
+                  *[index for first, last in runs for index in (f"{first + 1}.0", f"{last + 1}.0 lineend +1c")])
@@ -0,0 +1,149 @@
+"""One memory budget for every PIL image the desktop keeps around.
+
+Owners hand their frame lists to an ImageBudget together with a loader that
+can read them again and a callable saying whether they are on show right now.
+When the total goes over the limit, the least recently used inactive images are
+dropped (or shrunk, if they can't be reloaded). If that is not enough, the
+active ones are shrunk to the size they are drawn at. The registry updates
+each frame list in place, so owners always read it through frames(), which
+reloads on demand.
+
+    IMAGES = ImageBudget(256 * MB)
+    IMAGES.add(key, frames, loader=lambda: load_frames(path), active=icon.on_screen)
+    frame = IMAGES.frames(key, size)[i]
+"""
+import math
+from PIL import Image, ImageSequence
+
+MB = 1024 * 1024
+DEFAULT_BUDGET = 256 * MB
+
+def image_bytes(img):
+    return img.width * img.height * len(img.getbands())
+
+def photo_bytes(photo):
+    """Tk keeps photo images as 32-bit RGBA whatever PIL handed it"""
+    return photo.width() * photo.height() * 4
+
+def load_frames(path):
+    """Every frame of an animation as RGBA, or the one image of a still file, fully read"""
+    with Image.open(path) as img:
+        if getattr(img, "is_animated", False):
+            return [frame.convert("RGBA") for frame in ImageSequence.Iterator(img)]
+        img.load()
+        return [img.copy()]
+
+def shrink(img, size):
+    """Smallest copy that still covers a size x size square"""
+    factor = max(size / img.width, size / img.height)
+    if factor >= 1:
+        return img
+    return img.resize((max(1, math.ceil(img.width * factor)), max(1, math.ceil(img.height * factor))),
+                      Image.Resampling.LANCZOS)
+
+class Tracked:
+    def __init__(self, images, loader, active):
+        self.images = images      # The owner's list, updated in place
+        self.loader = loader      # () -> frames at full size, or None if they can't come back
+        self.active = active      # () -> True while the images are on show
+        self.full = True          # False once shrunk or dropped
+        self.size = None          # Largest side they're drawn at, as last asked for
+        self.last_used = 0
+        self.nbytes = sum(image_bytes(img) for img in images)
+
+class ImageBudget:
+    def __init__(self, limit=DEFAULT_BUDGET):
+        self.limit = limit
+        self.entries = {}
+        self.reserved = {}        # key -> bytes we count but can't evict (PhotoImages, wallpaper)
+        self.listeners = []       # Called with (used, limit) whenever either changes
+        self.clock = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.last_report = None
+
+    # --- Registration ---
+    def add(self, key, images, loader=None, active=None):
+        """Starts tracking a list of PIL images; from now on it is changed in place"""
+        self.entries[key] = Tracked(images, loader, active or (lambda: True))
+        self.touch(self.entries[key])
+        self.enforce(skip=key)
+
+    def remove(self, key):
+        self.entries.pop(key, None)
+        self.reserved.pop(key, None)
+        self.changed()
+
+    def reserve(self, key, nbytes):
+        if self.reserved.get(key) != nbytes:
+            self.reserved[key] = nbytes
+            self.changed()
+
+    def set_limit(self, limit):
+        self.limit = limit
+        self.enforce()
+
+    # --- Access ---
+    def frames(self, key, size=None):
+        """The frames for key, reloaded if they were dropped or are now too small for size"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return []
+        self.touch(entry)
+        if size:
+            entry.size = size
+        too_small = size and entry.images and max(entry.images[0].size) < size
+        if entry.loader and not entry.full and (not entry.images or too_small):
+            entry.images[:] = entry.loader()
+            entry.full = True
+            entry.nbytes = sum(image_bytes(img) for img in entry.images)
+            self.reloads += 1
+            self.enforce(skip=key)
+        return entry.images
+
+    def touch(self, entry):
+        self.clock += 1
+        entry.last_used = self.clock
+
+    def used(self):
+        return sum(e.nbytes for e in self.entries.values()) + sum(self.reserved.values())
+
+    # --- Eviction ---
+    def enforce(self, skip=None):
+        used = self.used()
+        if used > self.limit:
+            candidates = sorted((e for k, e in self.entries.items() if k != skip and e.images),
+                                key=lambda e: e.last_used)
+            inactive = [e for e in candidates if not e.active()]
+            # Off-screen images go first: dropped if they can come back, shrunk otherwise
+            for entry in inactive:
+                if used <= self.limit:
+                    break
+                used -= self.evict(entry, drop=entry.loader is not None)
+            # Then whatever is on show, down to the size it is drawn at
+            for entry in candidates:
+                if used <= self.limit:
+                    break
+                if entry.size:
+                    used -= self.evict(entry, drop=False)
+        self.changed()
+
+    def evict(self, entry, drop):
+        """Frees what it can from entry and returns the bytes released"""
+        before = entry.nbytes
+        if drop:
+            entry.images.clear()
+        elif entry.size:
+            entry.images[:] = [shrink(img, entry.size) for img in entry.images]
+        entry.nbytes = sum(image_bytes(img) for img in entry.images)
+        if entry.nbytes < before:
+            entry.full = False
+            self.evictions += 1
+        return before - entry.nbytes
+
+    def changed(self):
+        report = (self.used(), self.limit)
+        if report != self.last_report:
+            self.last_report = report
+            for listener in self.listeners:
+                listener(*report)
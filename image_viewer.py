@@ -0,0 +1,392 @@
+"""A zoomable viewer for very large images, drawn from a cached tile pyramid.
+
+tkinter.PhotoImage(file=...) (see lec2.py) decodes the whole image at full
+size into one Tk image. Here the image is decoded once, cut into TILE-pixel
+tiles at full size and at every halving down to one tile, and the tiles are
+cached on disk keyed by the file's path, size and mtime. After that, showing
+the image only decodes the tiles in view at the level that matches the zoom.
+Tiles are decoded on worker threads and kept in an LRU of PhotoImages capped
+in bytes, never below a few screenfuls of the current view.
+
+    viewer = ImageViewer(parent)
+    viewer.pack(fill="both", expand=True)
+    viewer.open("huge.png")
+
+Pyramid works without Tk. Pyramid(path).image_at((w, h)) gives a w x h
+rendering, and region(box, size) a part of one, read from the smallest level
+that covers it; the wallpaper and PaintApp's image import use it that way.
+"""
+import concurrent.futures
+import hashlib
+import json
+import math
+import os
+import queue
+import shutil
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from PIL import Image, ImageTk
+from image_budget import MB, photo_bytes
+
+# --- Pyramid Settings ---
+TILE = 256
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".image_viewer", "tiles")
+MAX_PIXELS = 1 << 30      # Pyramids are cut from files the user picked, so allow far past PIL's bomb guard
+
+# --- Viewer Settings ---
+TILE_WORKERS = 4
+MAX_PHOTO_BYTES = 64 * MB  # Tile PhotoImages kept for panning and zooming back
+VIEW_MARGIN = 3           # ...or this many screenfuls of tiles, when the view needs more
+POLL_MS = 15
+MIN_ZOOM = 1 / 64
+MAX_ZOOM = 8.0
+WHEEL_STEP = 1.25
+
+pixel_limit_lock = threading.Lock()
+
+def open_large(path):
+    """Image.open with the bomb guard raised to MAX_PIXELS for this call only.
+
+    PIL only reads its limit from a module global, and only checks it while
+    open() parses the header, so it is raised just around that.
+    """
+    with pixel_limit_lock:
+        limit = Image.MAX_IMAGE_PIXELS
+        if limit and limit < MAX_PIXELS:
+            Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+        try:
+            return Image.open(path)
+        finally:
+            Image.MAX_IMAGE_PIXELS = limit
+
+def cache_key(path):
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{TILE}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+# ================= PYRAMID =================
+
+class Pyramid:
+    """Tiles of an image at full size (level 0) and at each halving, cached on disk"""
+
+    def __init__(self, path, cache_dir=CACHE_DIR):
+        self.path = path
+        self.cache_dir = cache_dir
+        self.folder = None        # Set by build(), from the file's current size and mtime
+        self.levels = None        # [(width, height)] per level, once built
+        self.mode = None
+        self.lock = threading.Lock()
+
+    def build(self):
+        """Loads the pyramid's index, cutting the tiles first if they aren't cached"""
+        with self.lock:
+            if self.levels:
+                return self
+            self.folder = os.path.join(self.cache_dir, cache_key(self.path))
+            meta = os.path.join(self.folder, "meta.json")
+            try:
+                with open(meta, encoding="utf-8") as f:
+                    info = json.load(f)
+                self.levels, self.mode = [tuple(size) for size in info["levels"]], info["mode"]
+                return self
+            except (OSError, ValueError, KeyError):
+                pass
+            # Cut into a scratch folder and rename it into place, so a crash never leaves half a pyramid
+            scratch = self.folder + f".{os.getpid()}.{threading.get_ident()}"
+            shutil.rmtree(scratch, ignore_errors=True)
+            levels, mode = self.cut(scratch)
+            with open(os.path.join(scratch, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"levels": levels, "mode": mode}, f)
+            try:
+                os.replace(scratch, self.folder)
+            except OSError:
+                shutil.rmtree(scratch, ignore_errors=True)  # Another process got there first
+            self.levels, self.mode = [tuple(size) for size in levels], mode
+            return self
+
+    def cut(self, folder):
+        """Writes level 0 from the file, then each smaller level from the tiles of the one above.
+
+        PIL can't decode part of a compressed image, so level 0 needs the file
+        decoded once; each tile is converted on its own, and the decoded image
+        is gone before the halvings, which only ever hold 2x2 tiles.
+        """
+        os.makedirs(os.path.join(folder, "0"))
+        with open_large(self.path) as img:
+            mode = "RGBA" if "A" in img.getbands() or "transparency" in img.info else "RGB"
+            width, height = img.size
+            for row in range(math.ceil(height / TILE)):
+                for col in range(math.ceil(width / TILE)):
+                    box = (col * TILE, row * TILE, min(width, (col + 1) * TILE), min(height, (row + 1) * TILE))
+                    img.crop(box).convert(mode).save(self.tile_path(0, col, row, folder), compress_level=1)
+        levels = [(width, height)]
+        while width > TILE or height > TILE:
+            level = len(levels)
+            os.makedirs(os.path.join(folder, str(level)))
+            above_w, above_h = width, height
+            width, height = math.ceil(width / 2), math.ceil(height / 2)
+            for row in range(math.ceil(height / TILE)):
+                for col in range(math.ceil(width / TILE)):
+                    # The 2x2 tiles above start at even pixels, so this matches halving the whole level
+                    block = Image.new(mode, (min(2 * TILE, above_w - 2 * col * TILE), min(2 * TILE, above_h - 2 * row * TILE)))
+                    for dy in range(2 if block.height > TILE else 1):
+                        for dx in range(2 if block.width > TILE else 1):
+                            with Image.open(self.tile_path(level - 1, 2 * col + dx, 2 * row + dy, folder)) as part:
+                                block.paste(part, (dx * TILE, dy * TILE))
+                    # Box filter; exact halving, much faster than resize
+                    block.reduce(2).save(self.tile_path(level, col, row, folder), compress_level=1)
+            levels.append((width, height))
+        return levels, mode
+
+    def tile_path(self, level, col, row, folder=None):
+        return os.path.join(folder or self.folder, str(level), f"{col}_{row}.png")
+
+    def tile(self, level, col, row):
+        with Image.open(self.tile_path(level, col, row)) as img:
+            img.load()
+            return img
+
+    @property
+    def size(self):
+        return self.levels[0]
+
+    def level_for(self, zoom):
+        """Coarsest level that still has at least one source pixel per screen pixel at zoom"""
+        level = int(math.floor(math.log2(1 / zoom))) if zoom < 1 else 0
+        return max(0, min(level, len(self.levels) - 1))
+
+    def region(self, box, size):
+        """The full-size pixels in box (x0, y0, x1, y1) scaled to size, read from the smallest level that covers it"""
+        self.build()
+        x0, y0, x1, y1 = box
+        level = self.level_for(min(size[0] / max(x1 - x0, 1e-9), size[1] / max(y1 - y0, 1e-9)))
+        lw, lh = self.levels[level]
+        f = 2 ** level
+        # Tiles covering the box at this level, pasted together and cut down to the box
+        c0, r0 = max(0, int(x0 / f) // TILE), max(0, int(y0 / f) // TILE)
+        c1, r1 = min(math.ceil(lw / TILE), math.ceil(x1 / f / TILE)), min(math.ceil(lh / TILE), math.ceil(y1 / f / TILE))
+        canvas = Image.new(self.mode, ((c1 - c0) * TILE, (r1 - r0) * TILE))
+        for row in range(r0, r1):
+            for col in range(c0, c1):
+                canvas.paste(self.tile(level, col, row), ((col - c0) * TILE, (row - r0) * TILE))
+        crop = (x0 / f - c0 * TILE, y0 / f - r0 * TILE, x1 / f - c0 * TILE, y1 / f - r0 * TILE)
+        return canvas.resize(tuple(size), Image.Resampling.LANCZOS, box=crop)
+
+    def image_at(self, size):
+        """The whole image scaled to size"""
+        self.build()
+        return self.region((0, 0) + self.size, size)
+
+# ================= VIEWER =================
+
+class ImageViewer(tk.Frame):
+    """Canvas showing a Pyramid; drag to pan, wheel to zoom around the pointer"""
+
+    def __init__(self, parent, bg="#1e1e1e", **kw):
+        super().__init__(parent, bg=bg, **kw)
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.status = tk.Label(self, text="", bg=bg, fg="#aaa", anchor="w")
+        self.status.pack(fill="x")
+
+        self.pyramid = None
+        self.zoom = 1.0           # Screen pixels per full-size image pixel
+        self.origin = (0.0, 0.0)  # Full-size image pixel at the canvas's top-left corner
+        self.photos = OrderedDict()   # (level, col, row, shown size) -> PhotoImage, oldest first
+        self.photo_bytes = 0      # What the PhotoImages in self.photos hold
+        self.photo_limit = MAX_PHOTO_BYTES
+        self.items = {}           # Same key -> canvas item, for tiles currently drawn
+        self.wanted = set()       # Keys in view that haven't arrived yet
+        self.requested = set()    # Keys handed to the workers and not yet back
+        self.results = queue.Queue()
+        self.pool = concurrent.futures.ThreadPoolExecutor(TILE_WORKERS)
+        self.poll_job = None
+        self.drag = None
+        self.generation = 0       # Bumped by open(), so late tiles of the last image are ignored
+        self.loading = False
+
+        self.canvas.bind("<Configure>", lambda e: self.render())
+        self.canvas.bind("<ButtonPress-1>", self.start_pan)
+        self.canvas.bind("<B1-Motion>", self.pan)
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom_at(WHEEL_STEP if e.delta > 0 else 1 / WHEEL_STEP, e.x, e.y))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_at(WHEEL_STEP, e.x, e.y))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_at(1 / WHEEL_STEP, e.x, e.y))
+
+    # --- Opening ---
+    def open(self, path):
+        """Shows path; the first open of a file cuts its tiles on a worker thread"""
+        self.generation += 1
+        generation = self.generation
+        self.clear()
+        self.pyramid = None
+        self.loading = True
+        self.status.config(text=f"Preparing {os.path.basename(path)}...")
+        pyramid = Pyramid(path)
+        def build():
+            try:
+                self.results.put(("ready", generation, pyramid.build(), None))
+            except (OSError, ValueError) as e:
+                self.results.put(("error", generation, e, None))
+        self.pool.submit(build)
+        self.schedule_poll()
+
+    def clear(self):
+        for item in self.items.values():
+            self.canvas.delete(item)
+        self.items.clear()
+        self.photos.clear()
+        self.photo_bytes = 0
+        self.wanted.clear()
+        self.requested.clear()
+
+    def fit(self):
+        width, height = self.pyramid.size
+        view_w, view_h = max(self.canvas.winfo_width(), 1), max(self.canvas.winfo_height(), 1)
+        self.zoom = min(view_w / width, view_h / height, 1.0)
+        self.origin = ((width - view_w / self.zoom) / 2, (height - view_h / self.zoom) / 2)
+        self.render()
+
+    # --- Navigation ---
+    def start_pan(self, e):
+        self.drag = (e.x, e.y, self.origin)
+
+    def pan(self, e):
+        if not self.drag or not self.pyramid: return
+        x0, y0, (ox, oy) = self.drag
+        self.origin = (ox - (e.x - x0) / self.zoom, oy - (e.y - y0) / self.zoom)
+        self.render()
+
+    def zoom_at(self, factor, x, y):
+        if not self.pyramid: return
+        zoom = min(MAX_ZOOM, max(MIN_ZOOM, self.zoom * factor))
+        # Keep the image pixel under the pointer where it is
+        ox, oy = self.origin
+        px, py = ox + x / self.zoom, oy + y / self.zoom
+        self.zoom = zoom
+        self.origin = (px - x / zoom, py - y / zoom)
+        self.render()
+
+    # --- Drawing ---
+    def render(self):
+        if not self.pyramid: return
+        level = self.pyramid.level_for(self.zoom)
+        scale = self.zoom * (2 ** level)      # Screen pixels per pixel of this level
+        shown = max(1, round(TILE * scale))   # Size a whole tile is drawn at
+        lw, lh = self.pyramid.levels[level]
+        ox, oy = self.origin[0] / 2 ** level, self.origin[1] / 2 ** level
+        view_w, view_h = self.canvas.winfo_width(), self.canvas.winfo_height()
+
+        visible = set()
+        for row in range(max(0, int(oy // TILE)), min(math.ceil(lh / TILE), int((oy + view_h / scale) // TILE) + 1)):
+            for col in range(max(0, int(ox // TILE)), min(math.ceil(lw / TILE), int((ox + view_w / scale) // TILE) + 1)):
+                visible.add((level, col, row, shown))
+
+        for key in [k for k in self.items if k not in visible]:
+            self.canvas.delete(self.items.pop(key))
+        # A large screen or a deep zoom needs more than the fixed cap just to fill the view
+        self.photo_limit = max(MAX_PHOTO_BYTES, VIEW_MARGIN * len(visible) * shown * shown * 4)
+        self.wanted = {key for key in visible if key not in self.photos}
+        for key in visible:
+            if key in self.photos:
+                self.photos.move_to_end(key)
+                self.draw(key)
+            elif key not in self.requested:
+                self.requested.add(key)
+                self.pool.submit(self.decode, key, self.generation)
+        self.status.config(text=f"{self.pyramid.size[0]}x{self.pyramid.size[1]}   {self.zoom * 100:.0f}%   level {level}")
+        if self.requested: self.schedule_poll()
+
+    def draw(self, key):
+        level, col, row, shown = key
+        x = (col * TILE - self.origin[0] / 2 ** level) * shown / TILE
+        y = (row * TILE - self.origin[1] / 2 ** level) * shown / TILE
+        item = self.items.get(key)
+        if item: self.canvas.coords(item, x, y)
+        else: self.items[key] = self.canvas.create_image(x, y, image=self.photos[key], anchor="nw")
+
+    def decode(self, key, generation):
+        """Worker thread: reads a tile and scales it to the size it will be shown at.
+
+        Always answers, so the key can be requested again: None when it was skipped,
+        "missing" when the tile file couldn't be read.
+        """
+        if key not in self.wanted or generation != self.generation:
+            self.results.put(("tile", generation, key, None))  # Scrolled or zoomed past it meanwhile
+            return
+        level, col, row, shown = key
+        try:
+            img = self.pyramid.tile(level, col, row)
+        except OSError:
+            self.results.put(("missing", generation, key, None))
+            return
+        if shown != TILE:
+            size = (max(1, round(img.width * shown / TILE)), max(1, round(img.height * shown / TILE)))
+            img = img.resize(size, Image.Resampling.BILINEAR)
+        self.results.put(("tile", generation, key, img))
+
+    def schedule_poll(self):
+        if not self.poll_job: self.poll_job = self.after(POLL_MS, self.poll)
+
+    def poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                kind, generation, payload, img = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation:
+                continue
+            if kind == "ready":
+                self.loading = False
+                self.pyramid = payload
+                self.fit()
+                continue
+            if kind == "error":
+                self.loading = False
+                self.status.config(text=f"Could not open image: {payload}")
+                continue
+            self.requested.discard(payload)
+            if kind == "missing":
+                self.wanted.discard(payload)
+            elif img is None:
+                if payload in self.wanted:  # Came back into view after the worker skipped it
+                    self.requested.add(payload)
+                    self.pool.submit(self.decode, payload, generation)
+            elif payload in self.wanted:
+                self.wanted.discard(payload)
+                photo = self.photos[payload] = ImageTk.PhotoImage(img)
+                self.photo_bytes += photo_bytes(photo)
+                self.draw(payload)
+                while self.photo_bytes > self.photo_limit and len(self.photos) > 1:
+                    old, photo = self.photos.popitem(last=False)
+                    self.photo_bytes -= photo_bytes(photo)
+                    if old in self.items: self.canvas.delete(self.items.pop(old))
+        if self.requested or self.loading: self.schedule_poll()
+
+    def destroy(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
+class ImageViewerApp:
+    """The viewer as a stand-alone tool, taking its window like the other apps"""
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Image Viewer")
+        self.root.geometry("900x700")
+        self.viewer = ImageViewer(self.root)
+        self.viewer.pack(fill="both", expand=True)
+
+    def load_file(self, path):
+        self.root.title(f"{os.path.basename(path)} - Image Viewer")
+        self.viewer.open(path)
+
+if __name__ == "__main__":
+    import sys
+    from tkinter import filedialog
+    root = tk.Tk()
+    app = ImageViewerApp(root)
+    path = sys.argv[1] if len(sys.argv) > 1 else filedialog.askopenfilename()
+    if path: app.load_file(path)
+    root.mainloop()
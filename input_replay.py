@@ -0,0 +1,230 @@
+"""Record a GUI session's input and replay it as a benchmark.
+
+    python input_replay.py record paint.py stroke.rec       # use the app, close it to save
+    python input_replay.py replay paint.py stroke.rec       # recorded speed
+    python input_replay.py replay paint.py stroke.rec --max # as fast as the app keeps up
+    python input_replay.py replay main.py drag.rec --xvfb   # on a private virtual display
+
+The target is any of the scripts: it runs as __main__ with Tk's mainloop
+hooked, so the recorder or player attaches to whatever root the script makes.
+Events are stored relative to the widget that got them (by Tk path name, which
+is the same on every run of the same script), one tab-separated line each in
+a gzip file, with times as millisecond deltas.
+
+On replay every event is sent with event_generate, which runs its handlers
+right away; the time until handlers and the idle redraw work they queued are
+done is that event's latency. A report of p50/p95/p99/max per event type is
+printed at the end.
+"""
+import argparse
+import gzip
+import os
+import runpy
+import shutil
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+FORMAT = "tk-input-replay 1"
+SETTLE_MS = 500           # Let the app finish building its window before replaying
+# Tk event type -> the fields kept for it
+RECORDED = {
+    "ButtonPress": ("x", "y", "num", "state"),
+    "ButtonRelease": ("x", "y", "num", "state"),
+    "Motion": ("x", "y", "state"),
+    "KeyPress": ("keysym", "state"),
+    "KeyRelease": ("keysym", "state"),
+    "MouseWheel": ("x", "y", "delta", "state"),
+}
+# event_generate option for each field
+OPTIONS = {"x": "x", "y": "y", "num": "button", "state": "state", "keysym": "keysym", "delta": "delta"}
+
+# ================= FILE FORMAT =================
+
+def save(path, events):
+    """events: (seconds since start, type, widget path, {field: value})"""
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(FORMAT + "\n")
+        last = 0
+        for t, kind, widget, fields in events:
+            ms = int(t * 1000)
+            values = [str(fields[name]) for name in RECORDED[kind]]
+            f.write("\t".join([str(ms - last), kind, widget] + values) + "\n")
+            last = ms
+
+def load(path):
+    events = []
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        if f.readline().strip() != FORMAT:
+            raise ValueError(f"{path} is not an input recording")
+        ms = 0
+        for line in f:
+            delta, kind, widget, *values = line.rstrip("\n").split("\t")
+            ms += int(delta)
+            fields = {}
+            for name, value in zip(RECORDED[kind], values):
+                fields[name] = value if name == "keysym" else int(value)
+            events.append((ms / 1000, kind, widget, fields))
+    return events
+
+# ================= RECORDER =================
+
+class Recorder:
+    def __init__(self, root):
+        self.root = root
+        self.events = []
+        self.start = time.perf_counter()
+        for kind in RECORDED:
+            root.bind_all(f"<{kind}>", lambda e, k=kind: self.capture(k, e), add="+")
+
+    def capture(self, kind, event):
+        widget = str(event.widget)
+        if not widget.startswith("."):
+            return  # Menus and other widgets Tk made itself have no path we can find again
+        fields = {name: getattr(event, name) for name in RECORDED[kind]}
+        for name, value in fields.items():
+            if name != "keysym" and not isinstance(value, int):
+                fields[name] = 0  # Tk reports "??" for fields an event doesn't carry
+        self.events.append((time.perf_counter() - self.start, kind, widget, fields))
+
+# ================= PLAYER =================
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+class Player:
+    def __init__(self, root, events, max_speed=False, on_done=None):
+        self.root = root
+        self.events = events
+        self.max_speed = max_speed
+        self.on_done = on_done
+        self.latency = {}         # type -> [ms]
+        self.missing = 0          # Events whose widget no longer exists
+        self.index = 0
+        self.start = None
+
+    def play(self):
+        self.start = time.perf_counter()
+        self.step()
+
+    def step(self):
+        while self.index < len(self.events):
+            t, kind, widget, fields = self.events[self.index]
+            wait = t - (time.perf_counter() - self.start)
+            if not self.max_speed and wait > 0.001:
+                self.root.after(int(wait * 1000), self.step)
+                return
+            self.index += 1
+            self.send(kind, widget, fields)
+            if self.max_speed and self.index % 50 == 0:
+                # Let timers and redraws queued by the handlers run, like a real pause would
+                self.root.after(0, self.step)
+                return
+        if self.on_done:
+            self.on_done(self)
+
+    def send(self, kind, widget, fields):
+        try:
+            target = self.root.nametowidget(widget)
+        except KeyError:
+            self.missing += 1
+            return
+        options = {OPTIONS[name]: value for name, value in fields.items()}
+        if kind == "Motion":
+            options["warp"] = True  # So canvas items see the pointer where the event says
+        start = time.perf_counter()
+        try:
+            target.event_generate(f"<{kind}>", **options)
+            self.root.update_idletasks()
+        except tk.TclError:
+            self.missing += 1  # Widget went away between lookup and delivery
+            return
+        self.latency.setdefault(kind, []).append((time.perf_counter() - start) * 1000)
+
+    def report(self):
+        lines = [f"{'event':<14} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        every = []
+        for kind, samples in sorted(self.latency.items()):
+            every += samples
+            lines.append(f"{kind:<14} {len(samples):7} {percentile(samples, 50):8.2f} {percentile(samples, 95):8.2f}"
+                         f" {percentile(samples, 99):8.2f} {max(samples):8.2f}")
+        if every:
+            lines.append(f"{'all':<14} {len(every):7} {percentile(every, 50):8.2f} {percentile(every, 95):8.2f}"
+                         f" {percentile(every, 99):8.2f} {max(every):8.2f}")
+        elapsed = time.perf_counter() - self.start if self.start else 0.0
+        lines.append(f"{len(self.events)} events in {elapsed:.2f} s"
+                     + (f", {self.missing} skipped (widget not found)" if self.missing else ""))
+        return "\n".join(lines)
+
+# ================= RUNNING A SCRIPT =================
+
+def hook_mainloop(attach):
+    """Calls attach(root) when the script enters its mainloop; the returned list gets that root"""
+    original = tk.Misc.mainloop
+    roots = []
+    def mainloop(widget, n=0):
+        if not roots:
+            roots.append(widget)
+            attach(widget)
+        original(widget, n)
+    tk.Misc.mainloop = mainloop
+    return roots
+
+def run_script(script):
+    sys.argv = [script]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    runpy.run_path(script, run_name="__main__")
+
+def start_xvfb():
+    """Starts Xvfb on a free display and points DISPLAY at it; returns the process"""
+    if not shutil.which("Xvfb"):
+        sys.exit("Xvfb is not installed")
+    for number in range(90, 200):
+        if not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            proc = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for _ in range(50):
+                if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                    os.environ["DISPLAY"] = f":{number}"
+                    return proc
+                time.sleep(0.1)
+            proc.kill()
+    sys.exit("Could not start Xvfb")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay Tk input")
+    parser.add_argument("action", choices=["record", "replay"])
+    parser.add_argument("script", help="the app's script, e.g. paint.py or main.py")
+    parser.add_argument("recording")
+    parser.add_argument("--max", action="store_true", help="replay as fast as the app keeps up")
+    parser.add_argument("--xvfb", action="store_true", help="run on a private virtual display")
+    args = parser.parse_args(argv)
+
+    xvfb = start_xvfb() if args.xvfb else None
+    try:
+        if args.action == "record":
+            recorders = []
+            hook_mainloop(lambda root: recorders.append(Recorder(root)))
+            run_script(args.script)
+            if recorders:
+                save(args.recording, recorders[0].events)
+                print(f"Saved {len(recorders[0].events)} events to {args.recording}")
+        else:
+            events = load(args.recording)
+            players = []
+            def attach(root):
+                player = Player(root, events, args.max, on_done=lambda p: root.destroy())
+                players.append(player)
+                root.after(SETTLE_MS, player.play)
+            hook_mainloop(attach)
+            run_script(args.script)
+            if players:
+                print(players[0].report())
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""One resident Tk process that opens every tool as a Toplevel on demand.
+
+Only tkinter is imported at startup; each tool's module (and whatever it
+pulls in, like pygame or numpy) is imported the first time the tool is
+opened, and stays imported so the next window opens warm.
+
+    python launcher.py                     # launcher panel
+    python launcher.py notepad a.txt b.py  # open a tool straight away
+    python launcher.py --preload           # import the tools in the background
+    python launcher.py --new-instance      # don't hand off to a running launcher
+
+A launcher that is already running gets the arguments of later launches over
+a Unix socket (see single_instance.py), so those exit almost at once.
+"""
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+import tkinter as tk
+import single_instance
+
+# name -> (module, class); each class takes the window it should fill as "root"
+APPS = {
+    "calculator": ("calculator", "RealisticCalculator"),
+    "notepad": ("notepad", "Notepad"),
+    "paint": ("paint", "PaintApp"),
+    "musicplayer": ("musicplayer", "MusicPlayer"),
+}
+# Scripts that build their own Tk when imported, so they get their own process
+SCRIPTS = {"desktop": "main.py"}
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def app_class(name):
+    """Imports the tool's module on first use; later calls hit sys.modules"""
+    module_name, class_name = APPS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+def script_command(name):
+    if getattr(sys, "frozen", False):
+        # Frozen builds ship each script as its own executable next to the launcher
+        exe = os.path.join(os.path.dirname(sys.executable), os.path.splitext(SCRIPTS[name])[0])
+        return [exe + (".exe" if os.name == "nt" else "")]
+    return [sys.executable, os.path.join(HERE, SCRIPTS[name])]
+
+def open_files(app, files):
+    """Hands command-line files to tools that can open them"""
+    load = getattr(app, "load_file", None)
+    for path in files:
+        if load:
+            load(os.path.abspath(path))
+
+def preload():
+    """Imports every tool on a background thread so first opens are warm too"""
+    def work():
+        for module_name, _ in APPS.values():
+            try:
+                importlib.import_module(module_name)
+            except ImportError:
+                pass  # Missing optional dependency; opening that tool will report it
+    threading.Thread(target=work, daemon=True).start()
+
+class Launcher:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Launcher")
+        self.root.resizable(False, False)
+        self.windows = []  # (name, toplevel, app) for every open tool
+
+        for name in list(APPS) + list(SCRIPTS):
+            tk.Button(self.root, text=name.capitalize(), width=18,
+                      command=lambda n=name: self.open(n)).pack(padx=12, pady=3)
+        self.status = tk.Label(self.root, text="", fg="grey")
+        self.status.pack(pady=(3, 8))
+
+    def open(self, name, files=()):
+        """Opens a tool window and returns the app object (None for scripts)"""
+        start = time.perf_counter()
+        if name in SCRIPTS:
+            # Popen returns at once; the desktop starts in the background
+            subprocess.Popen(script_command(name) + [os.path.abspath(f) for f in files], cwd=HERE)
+            self.status.config(text=f"Started {name}")
+            return None
+        try:
+            cls = app_class(name)
+        except ImportError as e:
+            self.status.config(text=f"{name}: {e}")
+            return None
+        top = tk.Toplevel(self.root)
+        app = cls(top)
+        open_files(app, files)
+        self.windows.append((name, top, app))
+        top.bind("<Destroy>", lambda e, t=top: self.forget(t) if e.widget is t else None)
+        self.status.config(text=f"Opened {name} in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return app
+
+    def forget(self, top):
+        self.windows = [w for w in self.windows if w[1] is not top]
+
+    def handle(self, args, cwd):
+        """Acts on a command line, ours or one forwarded from a later launch"""
+        args = [a for a in args if not a.startswith("--")]
+        if args and (args[0] in APPS or args[0] in SCRIPTS):
+            self.open(args[0], [os.path.join(cwd, f) for f in args[1:]])
+        else:
+            # Plain relaunch: bring the panel forward
+            self.root.deiconify()
+            self.root.lift()
+            self.root.focus_force()
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    server = None
+    if "--new-instance" not in args:
+        server = single_instance.claim()
+        if server is None and single_instance.forward(args):
+            return  # The running launcher took it
+    root = tk.Tk()
+    launcher = Launcher(root)
+    if "--preload" in args:
+        preload()
+    if server:
+        server.attach(root, launcher.handle)
+    if any(not a.startswith("--") for a in args):
+        launcher.handle(args, os.getcwd())
+    try:
+        root.mainloop()
+    finally:
+        if server:
+            server.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# -*- mode: python ; coding: utf-8 -*-
+# One-folder build: nothing is unpacked to a temp dir on launch, unlike the
+# --onefile specs, and UPX is off so DLLs don't need decompressing either.
+# The tools are imported by name at runtime, so PyInstaller has to be told.
+
+
+a = Analysis(
+    ['launcher.py'],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=['calculator', 'calc_engine', 'notepad', 'highlighter', 'paint', 'musicplayer'],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[],
+    noarchive=False,
+    optimize=0,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='launcher',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='launcher',
+)
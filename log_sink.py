@@ -0,0 +1,101 @@
+"""A bounded, batched sink for a Tk Text log.
+
+write() may be called from any thread. Messages wait in a deque and are
+inserted once per frame with a single Text insert, however many arrived.
+The widget keeps at most max_lines lines; older ones are trimmed in one
+delete, and when more arrive in one frame than fit, only the newest
+max_lines are inserted at all. Nothing is scheduled while the queue is empty;
+a write from another thread wakes the Tk thread with a virtual event, which
+is safe to post from any thread. With a spill path, every message also goes to
+a rotating file through logging, so the full history survives the trimming.
+
+    sink = LogSink(text_widget, spill_path="~/.desktop/chat.log")
+    sink.write("Bot: hello")
+"""
+import collections
+import logging
+import logging.handlers
+import os
+import threading
+import tkinter as tk
+
+# --- Sink Settings ---
+MAX_LINES = 2000          # Lines kept in the widget
+TRIM_SLACK = 0.1          # Let it grow 10% past max_lines before trimming, so trims are rare
+FRAME_MS = 16
+SPILL_BYTES = 1024 * 1024
+SPILL_BACKUPS = 3
+WAKE_EVENT = "<<LogSinkWake>>"
+
+class LogSink:
+    def __init__(self, text, max_lines=MAX_LINES, spill_path=None, frame_ms=FRAME_MS):
+        self.text = text
+        self.max_lines = max_lines
+        self.frame_ms = frame_ms
+        # Only the newest max_lines can end up on screen, so that is all we hold
+        self.pending = collections.deque(maxlen=max_lines)
+        self.written = 0
+        self.spill = None
+        if spill_path:
+            self.spill = self.open_spill(os.path.expanduser(spill_path))
+        self.job = None
+        self.woken = False        # A wake event is on its way from another thread
+        self.tk_thread = threading.get_ident()
+        self.text.bind(WAKE_EVENT, lambda e: self.schedule(), add="+")
+
+    def open_spill(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        spill = logging.getLogger(f"log_sink.{path}")
+        spill.propagate = False
+        spill.setLevel(logging.INFO)
+        if not spill.handlers:
+            handler = logging.handlers.RotatingFileHandler(path, maxBytes=SPILL_BYTES, backupCount=SPILL_BACKUPS,
+                                                           encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            spill.addHandler(handler)
+        return spill
+
+    def write(self, message):
+        """Queues a message; safe from any thread"""
+        self.pending.append(message)   # deque appends are atomic
+        self.written += 1
+        if self.spill:
+            self.spill.info(message)   # Handlers lock around the file themselves
+        if threading.get_ident() == self.tk_thread:
+            self.schedule()
+        elif not self.woken:
+            self.woken = True
+            try:
+                self.text.event_generate(WAKE_EVENT, when="tail")
+            except (tk.TclError, RuntimeError):
+                pass  # Widget or main loop already gone
+
+    def schedule(self):
+        """Flushes at the next frame; Tk thread only"""
+        if not self.job:
+            self.job = self.text.after(self.frame_ms, self.flush)
+
+    def flush(self):
+        self.job = None
+        self.woken = False        # Before draining, so a write racing with us posts a new wake
+        if not self.text.winfo_exists():
+            return
+        batch = []
+        while self.pending:
+            batch.append(self.pending.popleft())
+        if batch:
+            at_bottom = self.text.yview()[1] >= 1.0
+            self.text.insert("end", "\n".join(batch) + "\n")
+            lines = int(self.text.index("end-1c").split(".")[0])
+            if lines > self.max_lines * (1 + TRIM_SLACK):
+                self.text.delete("1.0", f"{lines - self.max_lines}.0")
+            if at_bottom:
+                self.text.see("end")   # Don't yank the view away from someone reading back
+
+    def close(self):
+        if self.job:
+            self.text.after_cancel(self.job)
+            self.job = None
+        if self.spill:
+            for handler in self.spill.handlers:
+                handler.flush()
@@ -2,7 +2,20 @@ import tkinter as tk
 from tkinter import filedialog, simpledialog, scrolledtext, messagebox, Scale, Checkbutton
 import os
 import random
-from PIL import Image, ImageTk, ImageSequence, ImageOps
+import importlib
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+from PIL import Image, ImageTk, ImageOps
+from wallpaper import WallpaperPlayer
+from image_budget import ImageBudget, MB, load_frames, photo_bytes
+from file_index import FileIndex, Crawler
+from log_sink import LogSink
+import flowfield
+from window_manager import WindowManager
 
 # ================= GLOBAL CONFIGURATION =================
 SCREEN_W = 0
@@ -16,7 +29,8 @@ SELECTED_OBJECT = None
 
 ACTIONS = {}  
 APPS = []
-WALLPAPER_IMG = None 
+WALLPAPER = None     # WallpaperPlayer, made on first use
+IMAGES = ImageBudget()   # Every icon and animation frame is held through this
 
 # ================= MAIN WINDOW =================
 root = tk.Tk()
@@ -31,8 +45,13 @@ root.bind("<Escape>", lambda e: root.destroy())
 canvas = tk.Canvas(root, bg="#0b0f1a", highlightthickness=0)
 canvas.pack(fill="both", expand=True)
 
+# Occupancy grid of icons and panels the assistant walks around (None without numpy)
+NAV = flowfield.FlowField(SCREEN_W, SCREEN_H) if flowfield.available() else None
+
+# Geometry, stacking and minimize for every DraggableWindow
+WM = WindowManager(root, SCREEN_W, SCREEN_H)
+
 # Refs
-wallpaper_id = None
 gizmo_rect = None
 gizmo_handle = None
 
@@ -40,36 +59,253 @@ gizmo_handle = None
 class DraggableWindow(tk.Frame):
     def __init__(self, parent, title="Command Center", x=100, y=100, width=400, height=650):
         super().__init__(parent, bg="#222", bd=2, relief="raised")
-        self.place(x=x, y=y, width=width, height=height)
         
         self.title_bar = tk.Frame(self, bg="#333", height=35)
         self.title_bar.pack(fill="x", side="top")
         self.title_bar.pack_propagate(False)
         
-        tk.Label(self.title_bar, text=title, bg="#333", fg="white", font=("Arial", 11, "bold")).pack(side="left", padx=10)
+        self.title_label = tk.Label(self.title_bar, text=title, bg="#333", fg="white", font=("Arial", 11, "bold"))
+        self.title_label.pack(side="left", padx=10)
         tk.Button(self.title_bar, text="✕", bg="#ff4444", fg="white", bd=0, command=self.close_panel).pack(side="right", fill="y")
+        tk.Button(self.title_bar, text="–", bg="#444", fg="white", bd=0, width=2,
+                  command=lambda: WM.minimize(self, self.title_label.cget("text"))).pack(side="right", fill="y")
 
         self.content = tk.Frame(self, bg="#222")
         self.content.pack(fill="both", expand=True, padx=5, pady=5)
 
-        self.title_bar.bind("<Button-1>", self.start_drag)
-        self.title_bar.bind("<B1-Motion>", self.do_drag)
-        self._drag_data = {"x": 0, "y": 0}
+        # Motion only records the pointer; WM moves the panel once per frame
+        for widget in (self.title_bar, self.title_label):
+            widget.bind("<Button-1>", lambda e: WM.start_drag(self, e))
+            widget.bind("<B1-Motion>", lambda e: WM.drag_to(self, e))
+            widget.bind("<ButtonRelease-1>", lambda e: WM.end_drag(self, e))
+
+        # Keep the assistant's map of where panels are current
+        for seq in ("<Configure>", "<Map>"): self.bind(seq, self.update_obstacle, add="+")
+        for seq in ("<Unmap>", "<Destroy>"): self.bind(seq, self.clear_obstacle, add="+")
+        WM.manage(self, x, y, width, height)
+
+    def update_obstacle(self, e=None):
+        if not NAV or (e and e.widget is not self) or self not in WM.geometry: return
+        x, y, w, h = WM.geometry[self]
+        NAV.set_obstacle(self, x, y, x + w, y + h)
 
-    def start_drag(self, event):
-        self._drag_data["x"] = event.x
-        self._drag_data["y"] = event.y
-        self.lift() 
+    def clear_obstacle(self, e=None):
+        if NAV and (e is None or e.widget is self): NAV.remove_obstacle(self)
 
-    def do_drag(self, event):
-        x = self.winfo_x() + (event.x - self._drag_data["x"])
-        y = self.winfo_y() + (event.y - self._drag_data["y"])
-        self.place(x=x, y=y)
+    def set_visible(self, visible):
+        # Called by WM when the panel is hidden or shown
+        pass
 
     def close_panel(self):
-        self.place_forget()
+        WM.hide(self)
 
 settings_panel = None
+lbl_images = None
+
+# ================= PLUGIN APPS =================
+# The project's own tools run inside the desktop as panels instead of new processes.
+# name -> (module, class, label, file extensions it opens); the class takes the
+# window it should fill as "root", like it would a Tk or Toplevel.
+PLUGINS = {}
+PLUGIN_PREFIX = "app:"     # AppIcon paths like "app:notepad" open a plugin
+TITLE_BAR_H = 35
+MENU_BAR_H = 26
+LAUNCH_POLL_MS = 200
+open_windows = []
+launches = []              # Worker threads handing external paths to the OS
+launch_errors = queue.Queue()
+
+def register_plugin(name, module, cls, label=None, extensions=()):
+    PLUGINS[name] = (module, cls, label or name.capitalize(), tuple(extensions))
+
+register_plugin("paint", "paint", "PaintApp")
+register_plugin("notepad", "notepad", "Notepad", extensions=(".txt", ".py", ".md", ".log", ".json", ".csv", ".ini"))
+register_plugin("musicplayer", "musicplayer", "MusicPlayer", label="Music")
+register_plugin("calculator", "calculator", "RealisticCalculator")
+register_plugin("imageviewer", "image_viewer", "ImageViewerApp", label="Images",
+                extensions=(".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"))
+
+def plugin_for(path):
+    """Plugin name for an icon path, or None if the OS should open it"""
+    if path.startswith(PLUGIN_PREFIX):
+        return path[len(PLUGIN_PREFIX):]
+    ext = os.path.splitext(path)[1].lower()
+    for name, (_, _, _, extensions) in PLUGINS.items():
+        if ext in extensions:
+            return name
+    return None
+
+class HostedRoot(tk.Frame):
+    """Stands in for the Tk/Toplevel an app expects, so it can live inside an AppWindow"""
+
+    def __init__(self, window):
+        super().__init__(window.content, bg="#222")
+        self.pack(fill="both", expand=True)
+        self.window = window
+        self.on_close = None
+        self.bindings = []  # (sequence, funcid) added to the desktop root for us
+        self.closing = False
+        self.paused = False
+        self.parked = []    # Timer callbacks that came due while the panel was hidden
+
+    # --- Window manager calls ---
+    def title(self, text=None):
+        if text is None: return self.window.title_label.cget("text")
+        self.window.title_label.config(text=text)
+
+    def geometry(self, spec=None):
+        if spec is None: return f"{self.winfo_width()}x{self.winfo_height()}"
+        size = re.match(r"(\d+)x(\d+)", spec)
+        if size: self.window.resize(int(size.group(1)), int(size.group(2)))
+
+    def resizable(self, *args): pass
+
+    def protocol(self, name, func=None):
+        if name == "WM_DELETE_WINDOW": self.on_close = func
+
+    def configure(self, cnf=None, **kw):
+        menu = kw.pop("menu", None)
+        if menu is not None: self.window.set_menu(menu)
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    # --- Timers ---
+    def after(self, ms, func=None, *args):
+        # A hidden panel's timers stop: callbacks that come due wait until it is shown,
+        # so loops that reschedule themselves (polls, animations) go quiet
+        if func is None: return super().after(ms)
+        def run():
+            if self.paused: self.parked.append((func, args))
+            else: func(*args)
+        return super().after(ms, run)
+
+    def set_paused(self, paused):
+        self.paused = paused
+        if not paused:
+            parked, self.parked = self.parked, []
+            for func, args in parked: func(*args)
+
+    # --- Bindings ---
+    def bind(self, sequence=None, func=None, add=None):
+        # A Toplevel's bindings fire for events in all of its children; the desktop root
+        # gets those for every panel, so filter them down to the ones inside this one
+        if func is None: return super().bind(sequence, func, add)
+        def handler(e):
+            widget = str(e.widget)
+            if widget == str(self) or widget.startswith(str(self) + "."):
+                return func(e)
+        funcid = root.bind(sequence, handler, add="+")
+        self.bindings.append((sequence, funcid))
+        return funcid
+
+    def release_bindings(self):
+        for sequence, funcid in self.bindings:
+            script = "\n".join(line for line in root.bind(sequence).split("\n") if funcid not in line)
+            root.bind(sequence, script)
+            root.deletecommand(funcid)
+        self.bindings = []
+
+    def destroy(self):
+        # The app closing its "window" closes the whole panel
+        if not self.closing:
+            self.window.destroy()
+            return
+        super().destroy()
+
+class AppWindow(DraggableWindow):
+    """A DraggableWindow hosting a plugin app"""
+
+    def __init__(self, name, x, y):
+        super().__init__(root, title=PLUGINS[name][2], x=x, y=y, width=400, height=300)
+        self.name = name
+        self.menu_bar = None
+        self.host = HostedRoot(self)
+        self.app = None
+
+    def resize(self, width, height):
+        chrome = TITLE_BAR_H + (MENU_BAR_H if self.menu_bar else 0) + 14
+        WM.resize(self, min(width + 14, SCREEN_W), min(height + chrome, SCREEN_H - 40))
+
+    def set_visible(self, visible):
+        self.host.set_paused(not visible)
+
+    def set_menu(self, menu):
+        # Apps fill their menus after handing them over, so build the bar once they're done
+        self.menu_bar = tk.Frame(self, bg="#2b2b2b", height=MENU_BAR_H)
+        self.menu_bar.pack(fill="x", before=self.content)
+        self.after_idle(self.build_menu, menu)
+
+    def build_menu(self, menu):
+        end = menu.index("end")
+        for i in range(0 if end is None else end + 1):
+            if menu.type(i) != "cascade": continue
+            sub = menu.nametowidget(menu.entrycget(i, "menu"))
+            btn = tk.Button(self.menu_bar, text=menu.entrycget(i, "label"), bg="#2b2b2b", fg="white", bd=0, padx=8)
+            btn.config(command=lambda s=sub, b=btn: s.tk_popup(b.winfo_rootx(), b.winfo_rooty() + b.winfo_height()))
+            btn.pack(side="left")
+
+    def close_panel(self):
+        # Same as the window's close button: the app may ask to save first
+        if self.host.on_close: self.host.on_close()
+        else: self.host.destroy()
+
+    def destroy(self):
+        self.host.closing = True
+        self.host.release_bindings()
+        if self in open_windows: open_windows.remove(self)
+        WM.forget(self)
+        super().destroy()
+
+def open_plugin(name, files=()):
+    """Opens a plugin app in a new panel; the module is imported once and reused"""
+    module, cls, label, _ = PLUGINS[name]
+    try:
+        app_class = getattr(importlib.import_module(module), cls)
+    except ImportError as e:
+        bot_msg(f"{label} is unavailable: {e}")
+        return None
+    offset = 30 * (len(open_windows) % 10)
+    window = AppWindow(name, 160 + offset, 80 + offset)
+    open_windows.append(window)
+    window.app = app_class(window.host)
+    load = getattr(window.app, "load_file", None)
+    for path in files:
+        if load: load(path)
+    WM.raise_panel(window)
+    return window
+
+def external_command(path):
+    return ["open" if sys.platform == "darwin" else "xdg-open", path]
+
+def open_external(path):
+    """Hands a path to the OS on a worker thread so a slow opener never stalls the desktop"""
+    def work():
+        try:
+            if hasattr(os, "startfile"):
+                os.startfile(path)
+                return
+            proc = subprocess.Popen(external_command(path), cwd=os.path.dirname(path) or None,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if proc.wait():
+                launch_errors.put(f"No application is set up to open {os.path.basename(path)}")
+        except OSError as e:
+            launch_errors.put(f"Could not open {os.path.basename(path)}: {e}")
+    thread = threading.Thread(target=work, daemon=True)
+    thread.start()
+    launches.append(thread)
+    if len(launches) == 1: root.after(LAUNCH_POLL_MS, poll_launches)
+
+def poll_launches():
+    while not launch_errors.empty():
+        bot_msg(launch_errors.get())
+    launches[:] = [t for t in launches if t.is_alive()]
+    if launches: root.after(LAUNCH_POLL_MS, poll_launches)
+
+def open_path(path):
+    name = plugin_for(path)
+    if name in PLUGINS: open_plugin(name, [] if path.startswith(PLUGIN_PREFIX) else [path])
+    else: open_external(path)
 
 # ================= CLASS: APP ICON =================
 class AppIcon:
@@ -82,8 +318,9 @@ class AppIcon:
         self.angle = 0
         self.show_text = True
         
-        self.orig_pil = None
-        self.frames = []
+        self.key = ("icon", id(self))
+        self.has_image = False
+        self.frame_count = 0
         self.is_gif = False
         self.frame_index = 0
         self.anim_job = None
@@ -93,6 +330,12 @@ class AppIcon:
         self.ids = [self.icon_id, self.text_id]
         
         self.bind_events()
+        self.update_obstacle()
+
+    def update_obstacle(self):
+        if not NAV: return
+        s = self.size / 2
+        NAV.set_obstacle(self.key, self.x - s, self.y - s, self.x + s, self.y + s + 20)  # + the label
 
     def bind_events(self):
         for item in self.ids:
@@ -103,31 +346,28 @@ class AppIcon:
     def set_image(self, path):
         try:
             self.stop_animation()
-            raw_img = Image.open(path)
-            
-            if getattr(raw_img, "is_animated", False):
-                self.is_gif = True
-                self.frames = []
-                for frame in ImageSequence.Iterator(raw_img):
-                    self.frames.append(frame.convert("RGBA"))
-                self.animate_gif()
-            else:
-                self.is_gif = False
-                self.orig_pil = raw_img
-                self.redraw()
+            frames = load_frames(path)
+            IMAGES.add(self.key, frames, loader=lambda: load_frames(path), active=self.on_screen)
+            self.has_image = True
+            self.frame_count = len(frames)
+            self.frame_index = 0
+            self.is_gif = len(frames) > 1
+            if self.is_gif: self.animate_gif()
+            else: self.redraw()
         except Exception as e:
             print(f"Error: {e}")
 
     def animate_gif(self):
-        if not self.is_gif or not self.frames: return
+        if not self.is_gif: return
         
-        pil = self.frames[self.frame_index]
-        self.frame_index = (self.frame_index + 1) % len(self.frames)
+        pil = IMAGES.frames(self.key, self.size)[self.frame_index]
+        self.frame_index = (self.frame_index + 1) % self.frame_count
         
         # Resize dynamically to match Green Box size
         img = pil.resize((self.size, self.size), Image.Resampling.NEAREST)
         if self.angle != 0: img = img.rotate(-self.angle, expand=True)
         self.tk_img = ImageTk.PhotoImage(img)
+        IMAGES.reserve(self.key + ("photo",), photo_bytes(self.tk_img))
         
         canvas.delete(self.icon_id)
         self.icon_id = canvas.create_image(self.x, self.y, image=self.tk_img)
@@ -145,10 +385,11 @@ class AppIcon:
         # Called when resizing static images
         if self.is_gif: return
         
-        if self.orig_pil:
-            img = self.orig_pil.resize((self.size, self.size), Image.Resampling.LANCZOS)
+        if self.has_image:
+            img = IMAGES.frames(self.key, self.size)[0].resize((self.size, self.size), Image.Resampling.LANCZOS)
             if self.angle != 0: img = img.rotate(-self.angle, expand=True)
             self.tk_img = ImageTk.PhotoImage(img)
+            IMAGES.reserve(self.key + ("photo",), photo_bytes(self.tk_img))
             canvas.delete(self.icon_id)
             self.icon_id = canvas.create_image(self.x, self.y, image=self.tk_img)
         else:
@@ -162,6 +403,11 @@ class AppIcon:
         
         self.ids = [self.icon_id, self.text_id]
         self.bind_events()
+        self.update_obstacle()
+
+    def on_screen(self):
+        s = self.size / 2
+        return -s < self.x < SCREEN_W + s and -s < self.y < SCREEN_H + s
 
     def on_click(self, e):
         self.drag_offset = (e.x - self.x, e.y - self.y)
@@ -177,12 +423,11 @@ class AppIcon:
             canvas.coords(self.icon_id, self.x, self.y)
             canvas.coords(self.text_id, self.x, self.y + offset)
         
+        self.update_obstacle()
         if self == SELECTED_OBJECT: update_gizmo(self)
 
     def open_app(self, e):
-        if not EDIT_MODE:
-            try: os.startfile(self.path)
-            except: pass
+        if not EDIT_MODE: open_path(self.path)
 
 # ================= CLASS: ASSISTANT (FIXED) =================
 class Assistant:
@@ -196,6 +441,7 @@ class Assistant:
         self.facing_right = True
         self.is_moving = False
         self.patrol_dir = 1
+        self.target = None   # Grid cell being walked to in free-roam patrol
         
         self.angle = 0 
         self.show_text = False
@@ -212,6 +458,7 @@ class Assistant:
         d = ImageDraw.Draw(img)
         d.ellipse((0,0,50,50), fill='red')
         ACTIONS["idle"] = [img] # Store as List of PIL Images
+        IMAGES.add(("action", "idle"), ACTIONS["idle"])
 
     def animate(self):
         if not ASSISTANT_ACTIVE: return
@@ -219,8 +466,8 @@ class Assistant:
         # 1. Determine Action
         action = "walk" if self.is_moving else "idle"
         
-        # 2. Get Frame List
-        frames = ACTIONS.get(action, ACTIONS.get("idle"))
+        # 2. Get Frame List (through IMAGES, which reloads frames it had to drop)
+        frames = IMAGES.frames(("action", action), self.size) or IMAGES.frames(("action", "idle"), self.size)
         if not frames: return
 
         # 3. Cycle Frame
@@ -238,6 +485,7 @@ class Assistant:
         # Convert to Tkinter
         tk_img = ImageTk.PhotoImage(processed_img)
         self._tk_ref = tk_img # Keep reference
+        IMAGES.reserve(("assistant", "photo"), photo_bytes(tk_img))
 
         # 5. Draw/Update
         if not self.main_id:
@@ -252,7 +500,7 @@ class Assistant:
 
     # --- PATROL LOGIC ---
     def start_patrol(self):
-        self.y = SCREEN_H - 120
+        if not NAV: self.y = SCREEN_H - 120
         self.is_moving = True
         self.patrol_loop()
 
@@ -263,20 +511,33 @@ class Assistant:
         
         self.is_moving = True
         speed = 5
-        self.x += speed * self.patrol_dir
-        
-        # Bounce logic
-        if self.x > SCREEN_W - 50:
-            self.patrol_dir = -1
-            self.facing_right = False # Turn Left
-        elif self.x < 50:
-            self.patrol_dir = 1
-            self.facing_right = True  # Turn Right
+        if NAV: self.roam(speed)
+        else:
+            self.x += speed * self.patrol_dir
+            
+            # Bounce logic
+            if self.x > SCREEN_W - 50:
+                self.patrol_dir = -1
+                self.facing_right = False # Turn Left
+            elif self.x < 50:
+                self.patrol_dir = 1
+                self.facing_right = True  # Turn Right
             
         self.canvas.coords(self.main_id, self.x, self.y)
         if self == SELECTED_OBJECT: update_gizmo(self)
         root.after(20, self.patrol_loop)
 
+    def roam(self, speed):
+        # Free roam: follow the flow field to a random free spot, around icons and panels
+        if self.target is None: self.target = NAV.random_target()
+        step = NAV.direction(self.target, self.x, self.y) if self.target else None
+        if not step or step == (0.0, 0.0):
+            self.target = None  # Arrived, or walled off; pick somewhere else next tick
+            return
+        self.x += step[0] * speed
+        self.y += step[1] * speed
+        if abs(step[0]) > 0.3: self.facing_right = step[0] > 0
+
     def pause_patrol(self):
         global PATROL_MODE
         saved = PATROL_MODE
@@ -302,6 +563,10 @@ class Assistant:
         self.canvas.coords(self.main_id, self.x, self.y)
         if self == SELECTED_OBJECT: update_gizmo(self)
 
+    def showing(self, action):
+        # Only idle and walk are ever drawn; other actions can give their frames back
+        return ASSISTANT_ACTIVE and action in ("idle", "walk")
+
     # Required for Gizmo (The animate loop handles the actual drawing)
     def redraw(self): pass 
     def set_image(self, path): pass
@@ -325,28 +590,22 @@ def update_gizmo(obj):
 def on_gizmo(e, obj):
     new_size = max(abs(e.x - obj.x), abs(e.y - obj.y)) * 2
     if 30 < new_size < 800:
-        obj.size = int(new_size)
-        obj.redraw()
-        update_gizmo(obj)
-    if settings_panel and settings_panel.winfo_ismapped():
-        scale_size.set(obj.size)
+        queue_prop(obj, "size", int(new_size))
 
 def select_object(obj):
     global SELECTED_OBJECT
     SELECTED_OBJECT = obj
     update_gizmo(obj)
-    if settings_panel and settings_panel.winfo_ismapped():
-        populate_inspector(obj)
+    if inspector: inspector.bind(obj)
 
 # ================= SETTINGS UI =================
 def toggle_settings():
     if settings_panel:
-        if settings_panel.winfo_ismapped(): settings_panel.place_forget()
-        else: settings_panel.place(x=100, y=100); settings_panel.lift()
+        WM.toggle(settings_panel)
     else: create_settings_panel()
 
 def create_settings_panel():
-    global settings_panel, insp_frame, btn_edit_mode, list_actions, scale_size
+    global settings_panel, inspector, btn_edit_mode, list_actions
     settings_panel = DraggableWindow(root, title="Command Center", width=380, height=650)
     p = settings_panel.content
     
@@ -376,33 +635,101 @@ def create_settings_panel():
     refresh_action_list()
 
     # 4. Inspector
-    insp_frame = tk.LabelFrame(p, text="Inspector", bg="#222", fg="#00ff9d")
-    insp_frame.pack(fill="x", pady=5)
-    
-    # Placeholders
-    tk.Label(insp_frame, text="Size / Scale", bg="#222", fg="white").pack(anchor="w")
-    scale_size = Scale(insp_frame, from_=30, to=600, orient="horizontal", bg="#333", fg="white")
-    scale_size.pack(fill="x")
+    inspector = Inspector(p)
+    if SELECTED_OBJECT: inspector.bind(SELECTED_OBJECT)
 
     # 5. Desktop
     tk.Label(p, text="Desktop", bg="#222", fg="#aaa").pack(pady=(10,0))
     tk.Button(p, text="Set Wallpaper", command=set_wallpaper, bg="#555", fg="white").pack(fill="x")
+    tk.Button(p, text="Wallpaper Slideshow", command=set_wallpaper_folder, bg="#555", fg="white").pack(fill="x")
     tk.Button(p, text="+ Add App", command=add_app, bg="#00ff9d", fg="black").pack(fill="x")
 
-def populate_inspector(obj):
-    for w in insp_frame.winfo_children(): w.destroy()
-    tk.Label(insp_frame, text=f"Target: {obj.name}", bg="#222", fg="white").pack()
-    
-    # Scale Slider
-    tk.Label(insp_frame, text="Size", bg="#222", fg="white").pack(anchor="w")
-    global scale_size
-    scale_size = Scale(insp_frame, from_=30, to=600, orient="horizontal", bg="#333", fg="white",
-                       command=lambda v: update_prop(obj, "size", int(v)))
-    scale_size.set(obj.size)
-    scale_size.pack(fill="x")
-    
-    if hasattr(obj, 'set_image'):
-        tk.Button(insp_frame, text="Change Icon", bg="#00d4ff", command=lambda: change_img(obj)).pack(fill="x", pady=5)
+    # 6. Image memory
+    global lbl_images
+    lbl_images = tk.Label(p, bg="#222", fg="#aaa")
+    lbl_images.pack(anchor="w", pady=(10, 0))
+    budget = Scale(p, from_=32, to=2048, resolution=32, orient="horizontal", label="Image budget (MB)",
+                   bg="#333", fg="white", command=lambda v: IMAGES.set_limit(int(v) * MB))
+    budget.set(IMAGES.limit // MB)
+    budget.pack(fill="x")
+    show_image_usage(IMAGES.used(), IMAGES.limit)
+    f_apps = tk.Frame(p, bg="#222")
+    f_apps.pack(fill="x", pady=(5, 0))
+    for name, (_, _, label, _) in PLUGINS.items():
+        tk.Button(f_apps, text=label, command=lambda n=name: open_plugin(n), bg="#444", fg="white").pack(side="left", expand=True, fill="x")
+
+def show_image_usage(used, limit):
+    if lbl_images: lbl_images.config(text=f"Images: {used / MB:,.1f} MB of {limit / MB:,.0f} MB", fg="#ff4444" if used > limit else "#aaa")
+
+# ================= INSPECTOR =================
+# One editor per property, built once; selecting an object rebinds them.
+# (attribute, label, kind, options); rows for attributes the target lacks are hidden
+INSPECTOR_FIELDS = [
+    ("size", "Size", "scale", {"from_": 30, "to": 600}),
+    ("angle", "Rotation", "scale", {"from_": -180, "to": 180}),
+    ("show_text", "Show label", "check", {}),
+]
+PROP_FRAME_MS = 16
+pending_props = {}    # obj -> {prop: value} waiting for the next frame
+props_job = None
+inspector = None
+
+class Inspector:
+    def __init__(self, parent):
+        self.frame = tk.LabelFrame(parent, text="Inspector", bg="#222", fg="#00ff9d")
+        self.frame.pack(fill="x", pady=5)
+        self.target = None
+        self.lbl_target = tk.Label(self.frame, text="Nothing selected", bg="#222", fg="white")
+        self.lbl_target.pack()
+        self.rows = {}      # prop -> (row frame, variable)
+        for prop, label, kind, options in INSPECTOR_FIELDS:
+            row = tk.Frame(self.frame, bg="#222")
+            if kind == "scale":
+                var = tk.IntVar()
+                tk.Label(row, text=label, bg="#222", fg="white").pack(anchor="w")
+                Scale(row, variable=var, orient="horizontal", bg="#333", fg="white",
+                      command=lambda v, p=prop: self.changed(p, int(float(v))), **options).pack(fill="x")
+            else:
+                var = tk.IntVar()
+                Checkbutton(row, text=label, variable=var, bg="#222", fg="white", selectcolor="#444",
+                            command=lambda p=prop, v=var: self.changed(p, bool(v.get()))).pack(anchor="w")
+            self.rows[prop] = (row, var)
+        self.btn_icon = tk.Button(self.frame, text="Change Icon", bg="#00d4ff", command=lambda: change_img(self.target))
+
+    def bind(self, obj):
+        flush_props()  # Edits meant for the previous target land on it, not on this one
+        self.target = obj
+        self.lbl_target.config(text=f"Target: {obj.name}")
+        for prop, (row, var) in self.rows.items():
+            row.pack_forget()
+            if hasattr(obj, prop):
+                var.set(int(getattr(obj, prop)))
+                row.pack(fill="x")
+        self.btn_icon.pack_forget()
+        if hasattr(obj, 'set_image'): self.btn_icon.pack(fill="x", pady=5)
+
+    def show(self, obj, prop):
+        # Follows changes made elsewhere (the gizmo) without feeding them back
+        if obj is self.target and prop in self.rows: self.rows[prop][1].set(int(getattr(obj, prop)))
+
+    def changed(self, prop, value):
+        # Scales also call back when set() moves them, so skip values the target already has
+        if self.target is not None and getattr(self.target, prop, None) != value:
+            queue_prop(self.target, prop, value)
+
+def queue_prop(obj, prop, val):
+    """Debounced update_props: any number of changes per frame cost one redraw"""
+    global props_job
+    pending_props.setdefault(obj, {})[prop] = val
+    if not props_job: props_job = root.after(PROP_FRAME_MS, flush_props)
+
+def flush_props():
+    global props_job
+    if props_job: root.after_cancel(props_job)
+    props_job = None
+    while pending_props:
+        obj, changes = pending_props.popitem()
+        update_props(obj, changes)
 
 def refresh_action_list():
     list_actions.delete(0, tk.END)
@@ -410,10 +737,12 @@ def refresh_action_list():
     if "walk" not in ACTIONS: ACTIONS["walk"] = []
     for k in ACTIONS: list_actions.insert(tk.END, k)
 
-def update_prop(obj, prop, val):
-    setattr(obj, prop, val)
+def update_props(obj, changes):
+    for prop, val in changes.items(): setattr(obj, prop, val)
     obj.redraw()
-    if prop == "size": update_gizmo(obj)
+    if "size" in changes: update_gizmo(obj)
+    if inspector:
+        for prop in changes: inspector.show(obj, prop)
 
 def change_img(obj):
     path = filedialog.askopenfilename()
@@ -436,19 +765,27 @@ def toggle_patrol():
     PATROL_MODE = bool(var_patrol.get())
     if PATROL_MODE: assistant.start_patrol()
 
-def set_wallpaper():
-    global WALLPAPER_IMG, wallpaper_id
-    path = filedialog.askopenfilename()
+def set_wallpaper(path=None):
+    # Stills, animated GIF/APNG/WebP and image folders; frames are decoded off the Tk thread
+    global WALLPAPER
+    path = path or filedialog.askopenfilename(filetypes=[("Images", "*.png;*.jpg;*.jpeg;*.gif;*.webp;*.bmp"), ("All Files", "*.*")])
     if path:
-        img = Image.open(path).resize((SCREEN_W, SCREEN_H), Image.Resampling.LANCZOS)
-        WALLPAPER_IMG = ImageTk.PhotoImage(img)
-        if wallpaper_id: canvas.delete(wallpaper_id)
-        wallpaper_id = canvas.create_image(0, 0, image=WALLPAPER_IMG, anchor="nw")
-        canvas.tag_lower(wallpaper_id)
+        if not WALLPAPER:
+            WALLPAPER = WallpaperPlayer(canvas, (SCREEN_W, SCREEN_H), on_error=lambda e: bot_msg(f"Wallpaper: {e}"))
+        WALLPAPER.start(path)
+        IMAGES.reserve("wallpaper", WALLPAPER.nbytes())
 
-def add_app():
-    path = filedialog.askopenfilename()
-    if path: APPS.append(AppIcon(os.path.basename(path), path, 200, 200))
+def set_wallpaper_folder():
+    folder = filedialog.askdirectory()
+    if folder: set_wallpaper(folder)
+
+def add_app(path=None, x=200, y=200):
+    path = path or filedialog.askopenfilename()
+    if path: APPS.append(AppIcon(os.path.basename(path), path, x, y))
+
+def add_plugin_icons():
+    for i, (name, (_, _, label, _)) in enumerate(PLUGINS.items()):
+        APPS.append(AppIcon(label, PLUGIN_PREFIX + name, 60, 120 + i * 100))
 
 def add_action():
     name = simpledialog.askstring("New", "Action Name:")
@@ -462,8 +799,10 @@ def upload_act_img():
     name = list_actions.get(sel[0])
     paths = filedialog.askopenfilenames(filetypes=[("Images", "*.png;*.jpg;*.gif")])
     if paths:
-        frames = [Image.open(p) for p in paths]
+        load = lambda: [f for p in paths for f in load_frames(p)]
+        frames = load()
         ACTIONS[name] = frames # Store List of PIL
+        IMAGES.add(("action", name), frames, loader=load, active=lambda: assistant.showing(name))
         messagebox.showinfo("Success", f"Uploaded {len(frames)} frames to {name}")
 
 # ================= CHAT UI =================
@@ -486,8 +825,83 @@ log.pack(fill="both", expand=True)
 entry = tk.Entry(chat_frame, bg="#333", fg="white")
 entry.pack(fill="x")
 
-def bot_msg(txt): log.insert("end", f"Bot: {txt}\n"); log.see("end")
-entry.bind("<Return>", lambda e: bot_msg("Echo: " + entry.get()))
+# Batched into one insert per frame, trimmed to the last lines, full history in a rotating file
+CHAT_LOG_FILE = os.path.join(os.path.expanduser("~"), ".desktop", "chat.log")
+chat_log = LogSink(log, spill_path=CHAT_LOG_FILE)
+
+def bot_msg(txt): chat_log.write(f"Bot: {txt}")
+
+# ================= CHAT COMMANDS =================
+SEARCH_ROOTS_FILE = os.path.join(os.path.expanduser("~"), ".desktop", "search_roots.txt")
+SEARCH_RESULTS = 10
+search_index = FileIndex()
+search_results = []   # Paths from the last find, for "open N"
+
+def load_search_roots():
+    try:
+        with open(SEARCH_ROOTS_FILE, encoding="utf-8") as f:
+            roots = [line.strip() for line in f if line.strip()]
+    except OSError:
+        roots = []
+    return roots or [os.path.expanduser("~")]
+
+def save_search_roots(roots):
+    os.makedirs(os.path.dirname(SEARCH_ROOTS_FILE), exist_ok=True)
+    with open(SEARCH_ROOTS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(roots) + "\n")
+
+crawler = Crawler(search_index, load_search_roots())
+
+def cmd_find(args):
+    if not args: return bot_msg("Usage: find <words>")
+    start = time.perf_counter()
+    hits = search_index.search(args, SEARCH_RESULTS)
+    ms = (time.perf_counter() - start) * 1000
+    search_results[:] = [path for _, path in hits]
+    state = "" if crawler.passes else " (still indexing)"
+    if not hits: return bot_msg(f"No files match '{args}' in {search_index.count:,} indexed{state}")
+    lines = [f"{i}. {path}" for i, path in enumerate(search_results, 1)]
+    bot_msg(f"{len(hits)} matches in {ms:.1f} ms{state}; 'open N' puts one on the desktop\n" + "\n".join(lines))
+
+def cmd_open(args):
+    picks = args.split() or ["1"]
+    for n, pick in enumerate(picks):
+        if not pick.isdigit() or not 1 <= int(pick) <= len(search_results):
+            return bot_msg(f"No result {pick}; run find first")
+        add_app(search_results[int(pick) - 1], 200 + 90 * n, 200)
+
+def cmd_roots(args):
+    action, _, folder = args.partition(" ")
+    roots = list(crawler.roots)
+    folder = os.path.abspath(os.path.expanduser(folder.strip())) if folder.strip() else ""
+    if action == "add" and os.path.isdir(folder) and folder not in roots: roots.append(folder)
+    elif action == "remove" and folder in roots: roots.remove(folder)
+    elif action:
+        return bot_msg("Usage: roots [add|remove <folder>]")
+    if roots != crawler.roots:
+        save_search_roots(roots)
+        crawler.set_roots(roots)
+    bot_msg(f"Indexing {', '.join(roots)}: {search_index.count:,} files, last pass {crawler.last_pass:.1f} s")
+
+def cmd_help(args):
+    bot_msg("find <words> | open <N...> | roots [add|remove <folder>] | help")
+
+COMMANDS = {"find": cmd_find, "open": cmd_open, "roots": cmd_roots, "help": cmd_help}
+
+def run_command(e=None):
+    text = entry.get().strip()
+    entry.delete(0, "end")
+    if not text: return
+    chat_log.write(f"You: {text}")
+    name, _, args = text.partition(" ")
+    command = COMMANDS.get(name.lower())
+    if command: command(args.strip())
+    else: bot_msg(f"Unknown command '{name}', try help")
+
+entry.bind("<Return>", run_command)
+
+IMAGES.listeners.append(show_image_usage)
+add_plugin_icons()
 
 root.mainloop()
 
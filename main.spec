@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=['calculator', 'calc_engine', 'notepad', 'highlighter', 'paint', 'musicplayer', 'image_viewer'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -2,12 +2,78 @@ import tkinter as tk
 from tkinter import filedialog
 import pygame
 import os
+import hashlib
+import threading
+import queue
+
+# --- Waveform Settings ---
+PEAK_BUCKETS = 460      # One min/max pair per pixel column of the waveform strip
+PEAK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".musicplayer", "peaks")
+PEAK_VERSION = 2        # Part of the cache key; bump when compute_peaks changes
+
+np = None               # numpy, imported by the waveform code the first time it runs
+
+def load_numpy():
+    """numpy, or None when it isn't installed; the player then just has no waveform"""
+    global np
+    if np is None:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np
+
+def peak_cache_path(path):
+    """Cache file for a track, keyed by its absolute path, size and mtime"""
+    st = os.stat(path)
+    key = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{PEAK_BUCKETS}|{PEAK_VERSION}"
+    return os.path.join(PEAK_CACHE_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npy")
+
+def compute_peaks(path, buckets=PEAK_BUCKETS):
+    """Decodes a track and reduces it to (buckets, 2) int8 min/max pairs"""
+    sound = pygame.mixer.Sound(path)
+    samples = pygame.sndarray.array(sound)
+
+    # Normalise to -1..1 whatever the mixer sample format is; before the mixdown,
+    # which turns integer samples into floats
+    if np.issubdtype(samples.dtype, np.integer):
+        samples = samples / float(np.iinfo(samples.dtype).max)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)  # Mix channels down to mono
+
+    per_bucket = max(1, len(samples) // buckets)
+    usable = min(len(samples), per_bucket * buckets)
+    if usable == 0:
+        return np.zeros((buckets, 2), dtype=np.int8)
+    blocks = samples[:usable].reshape(-1, per_bucket)
+
+    peaks = np.zeros((buckets, 2), dtype=np.int8)
+    peaks[:len(blocks), 0] = np.clip(blocks.min(axis=1) * 127, -127, 127)
+    peaks[:len(blocks), 1] = np.clip(blocks.max(axis=1) * 127, -127, 127)
+    return peaks
+
+def load_peaks(path):
+    """Returns cached peaks for a track, or None if they are missing or stale"""
+    try:
+        peaks = np.load(peak_cache_path(path))
+    except (OSError, ValueError):
+        return None
+    return peaks if peaks.shape == (PEAK_BUCKETS, 2) else None
+
+def save_peaks(path, peaks):
+    os.makedirs(PEAK_CACHE_DIR, exist_ok=True)
+    target = peak_cache_path(path)
+    tmp = target + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, peaks)
+    os.replace(tmp, target)
 
 class MusicPlayer:
     def __init__(self, root):
         self.root = root
         self.root.title("Python MP3 Player")
-        self.root.geometry("500x400")
+        self.root.geometry("500x460")
         self.root.configure(bg="#212121")
         self.root.resizable(False, False)
 
@@ -19,6 +85,10 @@ class MusicPlayer:
         self.current_song_index = 0
         self.is_paused = False
 
+        # Waveform Variables (peaks are decoded on a worker thread)
+        self.waveform_path = None
+        self.waveform_queue = queue.Queue()
+
         # --- UI Design ---
         
         # 1. Image/Logo Area (Placeholder for Album Art)
@@ -26,6 +96,10 @@ class MusicPlayer:
         logo_frame.pack(fill=tk.X, pady=10)
         tk.Label(logo_frame, text="Music Player", bg="#212121", fg="#ff5722", font=("Arial", 18, "bold")).pack()
 
+        # Waveform strip for the current track
+        self.wave_canvas = tk.Canvas(logo_frame, bg="#212121", height=60, width=PEAK_BUCKETS, highlightthickness=0)
+        self.wave_canvas.pack(pady=(5, 0))
+
         # 2. Playlist Box
         frame_list = tk.Frame(self.root, bg="#212121")
         frame_list.pack(fill=tk.BOTH, expand=True, padx=20, pady=5)
@@ -62,6 +136,8 @@ class MusicPlayer:
         self.status_bar = tk.Label(self.root, text="Waiting for music...", bd=1, relief=tk.SUNKEN, anchor=tk.W, bg="#333", fg="white")
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
+        self.poll_waveform()
+
     def load_music(self):
         """Loads a folder of music"""
         directory = filedialog.askdirectory()
@@ -125,6 +201,63 @@ class MusicPlayer:
         self.is_paused = False
         self.status_bar.config(text=f"Playing: {song_name}")
 
+        self.show_waveform(os.path.abspath(song_name))
+
+    # --- Waveform Logic ---
+
+    def show_waveform(self, path):
+        """Draws cached peaks at once, otherwise decodes them in the background"""
+        self.waveform_path = path
+        self.wave_canvas.delete("all")
+        if load_numpy() is None:
+            self.wave_canvas.create_text(PEAK_BUCKETS // 2, 30, text="Waveform needs NumPy", fill="#777")
+            return
+
+        peaks = load_peaks(path)
+        if peaks is not None:
+            self.draw_waveform(peaks)
+            return
+
+        self.wave_canvas.create_text(PEAK_BUCKETS // 2, 30, text="Analysing...", fill="#777")
+        threading.Thread(target=self.waveform_worker, args=(path,), daemon=True).start()
+
+    def waveform_worker(self, path):
+        peaks = error = None
+        try:
+            peaks = compute_peaks(path)
+        except Exception as e:
+            error = e   # pygame raises its own error types for undecodable files
+        if peaks is not None:
+            try:
+                save_peaks(path, peaks)
+            except OSError:
+                pass    # Not cached; it is still drawn this time
+        self.waveform_queue.put((path, peaks, error))
+
+    def poll_waveform(self):
+        """Picks up finished peaks on the Tk thread (Tk is not thread safe)"""
+        if not self.root.winfo_exists():
+            return
+        try:
+            while True:
+                path, peaks, error = self.waveform_queue.get_nowait()
+                # Ignore results for tracks that are no longer playing
+                if path == self.waveform_path:
+                    self.wave_canvas.delete("all")
+                    if peaks is not None:
+                        self.draw_waveform(peaks)
+                    else:
+                        self.status_bar.config(text=f"Waveform unavailable: {error}")
+        except queue.Empty:
+            pass
+        self.root.after(100, self.poll_waveform)
+
+    def draw_waveform(self, peaks):
+        mid = int(self.wave_canvas["height"]) // 2
+        scale = mid / 127.0
+        for x, (low, high) in enumerate(peaks.tolist()):
+            self.wave_canvas.create_line(x, mid - high * scale, x, mid - low * scale + 1, fill="#ff5722")
+
     def next_song(self):
         if self.playlist:
             self.current_song_index = (self.current_song_index + 1) % len(self.playlist)
@@ -1,5 +1,341 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, simpledialog, ttk
+from tkinter import font as tkfont
+from array import array
+from highlighter import Highlighter, language_for, LEXERS
+import bisect
+import codecs
+import json
+import mmap
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+
+# --- Loading Settings ---
+CHUNK_SIZE = 256 * 1024          # Bytes decoded and inserted per idle step
+FALLBACK_ENCODING = "latin-1"    # Decodes any byte, used once UTF-8 fails
+
+# Byte order marks, longest first so UTF-32 is not mistaken for UTF-16
+BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"), (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+def sniff_encoding(head):
+    """Guesses the encoding from the first bytes of a file"""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    return "utf-8"
+
+# --- Viewer Settings ---
+INDEX_STRIDE = 64                # One checkpoint offset stored per 64 lines
+INDEX_BLOCK = 1024 * 1024        # Bytes scanned per step of the indexing thread
+MAX_WINDOW_BYTES = 1024 * 1024   # Cap on what one rendered window may decode
+NEWLINE = re.compile(b"\n")
+
+class LargeFileViewer:
+    """Read-only view of a memory-mapped file.
+
+    Only the lines that fit on screen are decoded and put in the Text widget.
+    A background thread records the byte offset of every INDEX_STRIDE-th line,
+    so any line is found with one lookup plus at most INDEX_STRIDE short scans.
+    """
+    def __init__(self, path):
+        self.text = None
+        self.path = path
+        self.file = open(path, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.encoding = sniff_encoding(self.mm[:4])
+        if self.encoding in ("utf-16", "utf-32"):
+            self.encoding = "latin-1"  # Lines are split on b"\n", so only byte-wide encodings work
+
+        self.checkpoints = array("Q", [0])  # Offset of lines 0, STRIDE, 2*STRIDE...
+        self.line_count = 1                 # Grows while indexing runs
+        self.indexing = True
+        self.stop_event = threading.Event()
+        self.top = 0                        # First line shown
+        self.rows = 1
+        self.linespace = 1
+
+        self.index_thread = threading.Thread(target=self.build_index, daemon=True)
+        self.index_thread.start()
+
+    def build_index(self):
+        lines = 0
+        size = len(self.mm)
+        for start in range(0, size, INDEX_BLOCK):
+            if self.stop_event.is_set():
+                return
+            ends = [m.end() for m in NEWLINE.finditer(self.mm, start, min(start + INDEX_BLOCK, size))]
+            # Newline number lines+i+1 starts line lines+i+1, keep those divisible by STRIDE
+            first = (INDEX_STRIDE - lines % INDEX_STRIDE) - 1
+            self.checkpoints.extend(e for e in ends[first::INDEX_STRIDE] if e < size)
+            lines += len(ends)
+            self.line_count = lines + 1
+        # A trailing newline does not start another line
+        if size and self.mm[size - 1:size] == b"\n":
+            self.line_count = lines
+        self.indexing = False
+
+    def line_offset(self, line):
+        """Byte offset where a line starts, or None if it is not indexed yet"""
+        block, rest = divmod(line, INDEX_STRIDE)
+        if block >= len(self.checkpoints):
+            return None
+        pos = self.checkpoints[block]
+        for _ in range(rest):
+            pos = self.mm.find(b"\n", pos)
+            if pos == -1:
+                return None
+            pos += 1
+        return pos
+
+    def attach(self, text):
+        """Shows the file in a Text widget, or in none while its tab is dormant"""
+        self.text = text
+        if text is not None:
+            self.linespace = tkfont.Font(font=text["font"]).metrics("linespace")
+
+    def render(self):
+        """Replaces the Text contents with the lines visible from self.top"""
+        if self.text is None:
+            return
+        self.rows = max(1, self.text.winfo_height() // self.linespace)
+        self.top = max(0, min(self.top, self.line_count - self.rows))
+
+        start = self.line_offset(self.top)
+        if start is None:
+            # Not indexed that far yet, show the furthest known place instead
+            self.top = (len(self.checkpoints) - 1) * INDEX_STRIDE
+            start = self.checkpoints[-1]
+        end = start
+        for _ in range(self.rows):
+            end = self.mm.find(b"\n", end, start + MAX_WINDOW_BYTES)
+            if end == -1:
+                end = min(len(self.mm), start + MAX_WINDOW_BYTES)
+                break
+            end += 1
+        chunk = self.mm[start:end].decode(self.encoding, errors="replace")
+
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(1.0, chunk.rstrip("\n").replace("\r\n", "\n"))
+        self.text.config(state=tk.DISABLED)
+
+    def scroll_fraction(self):
+        total = max(self.line_count, 1)
+        return self.top / total, min(1.0, (self.top + self.rows) / total)
+
+    def yview(self, *args):
+        """Scrollbar command, in the same format Text.yview receives"""
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self.line_count)
+        elif args[0] == "scroll":
+            step = self.rows if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.render()
+
+    def goto_line(self, line):
+        self.top = line - 1
+        self.render()
+
+    def close(self):
+        self.stop_event.set()
+        self.index_thread.join()
+        self.mm.close()
+        self.file.close()
+
+# --- Find / Replace Engine ---
+# These run on a worker thread against a snapshot of the buffer, so they only
+# deal in plain strings and never touch Tk.
+
+def compile_pattern(query, regex=False, match_case=False):
+    flags = 0 if match_case else re.IGNORECASE
+    return re.compile(query if regex else re.escape(query), flags | re.MULTILINE)
+
+def offset_to_index(text, offset):
+    """Converts a string offset to a (line, col) Text index"""
+    line = 1 + text.count("\n", 0, offset)
+    line_start = text.rfind("\n", 0, offset) + 1
+    return line, offset - line_start
+
+def find_matches(text, pattern):
+    """All non-empty matches as (line, col, end_line, end_col), in buffer order"""
+    matches = []
+    line, pos, line_start = 1, 0, 0
+    for m in pattern.finditer(text):
+        start, end = m.span()
+        if start == end:
+            continue
+        newlines = text.count("\n", pos, start)
+        if newlines:
+            line += newlines
+            line_start = text.rindex("\n", pos, start) + 1
+        pos = start
+
+        end_line = line + text.count("\n", start, end)
+        end_col = end - (text.rfind("\n", start, end) + 1 if end_line != line else line_start)
+        matches.append((line, start - line_start, end_line, end_col))
+    return matches
+
+def replace_all(text, pattern, replacement, regex=False):
+    """Returns (count, start_index, end_index, new_middle) describing one edit, or None.
+
+    Only the span from the first to the last match is replaced, which keeps the
+    edit (and the single undo step that records it) as small as possible.
+    """
+    spans = [m.span() for m in pattern.finditer(text)]
+    if not spans:
+        return None
+    repl = replacement if regex else (lambda m: replacement)
+    new_text, count = pattern.subn(repl, text)
+
+    first, last = spans[0][0], spans[-1][1]
+    middle = new_text[first:len(new_text) - (len(text) - last)]
+    return count, offset_to_index(text, first), offset_to_index(text, last), middle
+
+# --- Save Settings ---
+AUTOSAVE_MS = 10_000
+RECOVERY_DIR = os.path.join(os.path.expanduser("~"), ".notepad", "recovery")
+
+def atomic_write(path, text, encoding):
+    """Writes text to path via a fsynced temp file and a rename.
+
+    Readers (and a crash at any point) see either the old file or the new one,
+    never a half-written mix.
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=encoding, newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+    # Make the rename itself durable (directories cannot be opened on Windows)
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def write_journal(journal, path, encoding, text):
+    """Journal format: one JSON header line, then the raw buffer"""
+    os.makedirs(RECOVERY_DIR, exist_ok=True)
+    header = json.dumps({"path": path, "encoding": encoding, "pid": os.getpid(), "time": time.time()})
+    atomic_write(journal, header + "\n" + text, "utf-8")
+
+def read_journal(journal):
+    with open(journal, encoding="utf-8", newline="") as f:
+        header = json.loads(f.readline())
+        return header, f.read()
+
+# Win32 values for windows_process_alive
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_INVALID_PARAMETER = 87
+STILL_ACTIVE = 259
+
+def process_alive(pid):
+    """False only when the process is known to be gone; a journal whose owner can't be
+    confirmed dead is never offered for recovery (and so never deleted)"""
+    if not isinstance(pid, int) or pid <= 0:
+        return True
+    if os.name == "nt":
+        return windows_process_alive(pid)  # os.kill(pid, 0) would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def windows_process_alive(pid):
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # No such process id; any other failure (access denied) means it exists
+        return ctypes.get_last_error() != ERROR_INVALID_PARAMETER
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+def orphaned_journals():
+    """Journals left behind by Notepad processes that are no longer running"""
+    if not os.path.isdir(RECOVERY_DIR):
+        return []
+    found = []
+    for name in sorted(os.listdir(RECOVERY_DIR)):
+        journal = os.path.join(RECOVERY_DIR, name)
+        if not name.endswith(".journal"):
+            continue
+        try:
+            header, _ = read_journal(journal)
+        except (OSError, ValueError):
+            continue
+        if not process_alive(header.get("pid", -1)):
+            found.append((journal, header))
+    return found
+
+# --- Tab Settings ---
+MAX_LIVE_TABS = 5   # Documents that keep a Text widget (and undo stack) at once
+
+class Document:
+    """One open file and everything that belongs to it.
+
+    Only hydrated documents own a Text widget. A dormant document keeps its
+    buffer as a plain string, or nothing at all when it is unchanged on disk
+    and can simply be read again the next time its tab is focused.
+    """
+    def __init__(self, frame, path=None):
+        self.frame = frame       # Notebook page, the Text is built inside it on demand
+        self.path = path
+        self.encoding = "utf-8"
+        self.text = None         # Text widget while hydrated
+        self.scrollbar = None
+        self.content = None      # Buffer while dormant, None means "read it from path"
+        self.dirty = False       # Changed since the last save to the real file
+        self.modified = False    # Tk modified flag, remembered while dormant
+        self.edits = 0           # Bumped on each edit after the flag was cleared; saves compare it
+        self.note = ""           # Title suffix, e.g. " [read only]"
+        self.loader = None       # State of a streaming load in progress
+        self.loader_job = None
+        self.viewer = None       # LargeFileViewer in viewer mode
+        self.language = language_for(path)  # Syntax highlighting, None for plain text
+        self.highlighter = None
+        self.journal_path = os.path.join(RECOVERY_DIR, f"{os.getpid()}-{id(self):x}.journal")
+
+    @property
+    def name(self):
+        return os.path.basename(self.path) if self.path else "Untitled"
+
+    def get_text(self):
+        if self.text:
+            return self.text.get(1.0, "end-1c")
+        return self.content
 
 class Notepad:
     def __init__(self, root):
@@ -7,15 +343,46 @@ class Notepad:
         self.root.title("Untitled - Notepad")
         self.root.geometry("800x600")
 
-        # --- Text Area ---
-        # undo=True enables Ctrl+Z functionality
-        self.text_area = tk.Text(self.root, font=("Arial", 14), undo=True, wrap="word")
-        self.text_area.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
+        # --- Documents ---
+        self.docs = []           # In tab order
+        self.live = []           # Hydrated documents, least recently focused first
+        self.doc = None          # Document in the focused tab
+
+        # --- Save State ---
+        # The Tk modified flag means "changed since the last save or journal write",
+        # Document.dirty means "changed since the last save to the real file".
+        self.save_jobs = queue.Queue()
+        self.save_results = queue.Queue()
+        threading.Thread(target=self.save_worker, daemon=True).start()
+
+        # --- Find State ---
+        self.find_dialog = None
+        self.matches = []             # (line, col, end_line, end_col) from the last search
+        self.matches_pattern = None
+        self.painted_matches = set()  # Indexes into self.matches that carry the "found" tag
+        self.paint_job = None
+        self.search_generation = 0    # Results from older searches are dropped
+        self.search_results = queue.Queue()
+        self.viewer_job = None
+
+        # --- Status Bar (packed first so it keeps the full bottom row) ---
+        self.status_frame = tk.Frame(self.root, bd=1, relief=tk.SUNKEN)
+        self.status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_label = tk.Label(self.status_frame, text="Ready", anchor=tk.W)
+        self.status_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.progress = ttk.Progressbar(self.status_frame, length=200, maximum=100)
+        self.cancel_btn = tk.Button(self.status_frame, text="Cancel", command=self.cancel_load)
 
-        # --- Scrollbar ---
-        scrollbar = tk.Scrollbar(self.root, command=self.text_area.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.text_area.config(yscrollcommand=scrollbar.set)
+        # --- Tabs ---
+        self.notebook = ttk.Notebook(self.root)
+        self.notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        self.root.bind("<Control-g>", lambda e: self.goto_line())
+        self.root.bind("<Control-f>", lambda e: self.open_find())
+        self.root.bind("<Control-s>", lambda e: self.save_file())
+        self.root.bind("<Control-w>", lambda e: self.close_tab())
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
 
         # --- Menu Bar ---
         self.menu_bar = tk.Menu(self.root)
@@ -26,9 +393,12 @@ class Notepad:
         self.menu_bar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="New", command=self.new_file)
         file_menu.add_command(label="Open", command=self.open_file)
-        file_menu.add_command(label="Save", command=self.save_file)
+        file_menu.add_command(label="Open in Viewer...", command=self.open_viewer)
+        file_menu.add_command(label="Save", command=self.save_file, accelerator="Ctrl+S")
+        file_menu.add_command(label="Save As...", command=self.save_file_as)
+        file_menu.add_command(label="Close Tab", command=self.close_tab, accelerator="Ctrl+W")
         file_menu.add_separator()
-        file_menu.add_command(label="Exit", command=self.root.quit)
+        file_menu.add_command(label="Exit", command=self.exit_app)
 
         # Edit Menu
         edit_menu = tk.Menu(self.menu_bar, tearoff=0)
@@ -36,30 +406,765 @@ class Notepad:
         edit_menu.add_command(label="Cut", command=lambda: self.root.focus_get().event_generate('<<Cut>>'))
         edit_menu.add_command(label="Copy", command=lambda: self.root.focus_get().event_generate('<<Copy>>'))
         edit_menu.add_command(label="Paste", command=lambda: self.root.focus_get().event_generate('<<Paste>>'))
-        edit_menu.add_command(label="Undo", command=self.text_area.edit_undo)
-        edit_menu.add_command(label="Redo", command=self.text_area.edit_redo)
+        edit_menu.add_command(label="Undo", command=lambda: self.text_area.edit_undo())
+        edit_menu.add_command(label="Redo", command=lambda: self.text_area.edit_redo())
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Find / Replace...", command=self.open_find, accelerator="Ctrl+F")
+        edit_menu.add_command(label="Go to Line...", command=self.goto_line, accelerator="Ctrl+G")
+
+        # View Menu
+        view_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.menu_bar.add_cascade(label="View", menu=view_menu)
+        self.var_language = tk.StringVar(value="")
+        view_menu.add_radiobutton(label="Plain Text", value="", variable=self.var_language,
+                                  command=self.on_language_menu)
+        for language in LEXERS:
+            view_menu.add_radiobutton(label=language.title(), value=language, variable=self.var_language,
+                                      command=self.on_language_menu)
+
+        self.new_file()
+        self.poll_saves()
+        self.root.after(AUTOSAVE_MS, self.autosave)
+        self.root.after(100, self.offer_recovery)
+
+    # --- Focused Document ---
+    # The editing code below works on "the" text area, these point it at the focused tab.
+
+    @property
+    def text_area(self):
+        return self.doc.text
+
+    @property
+    def scrollbar(self):
+        return self.doc.scrollbar
+
+    @property
+    def current_file(self):
+        return self.doc.path
+
+    @current_file.setter
+    def current_file(self, path):
+        self.doc.path = path
+
+    @property
+    def encoding(self):
+        return self.doc.encoding
+
+    @encoding.setter
+    def encoding(self, encoding):
+        self.doc.encoding = encoding
+
+    @property
+    def viewer(self):
+        return self.doc.viewer
+
+    # --- Tabs ---
+
+    def add_document(self, path=None):
+        frame = tk.Frame(self.notebook)
+        doc = Document(frame, path)
+        self.docs.append(doc)
+        self.notebook.add(frame, text=doc.name)
+        return doc
+
+    def select(self, doc):
+        self.notebook.select(doc.frame)
+        self.on_tab_changed()  # Hydrates now rather than when the virtual event arrives
+
+    def on_tab_changed(self, event=None):
+        selected = self.notebook.select()
+        doc = next((d for d in self.docs if str(d.frame) == selected), None)
+        if doc is None or doc is self.doc:
+            return
+        if self.doc and self.doc.text:
+            self.clear_matches()
+        self.search_generation += 1
+        self.doc = doc
+        self.hydrate(doc)
+        self.refresh_title(doc)
+        self.show_progress(doc)
+        self.var_language.set(doc.language or "")
+        if doc.viewer:
+            self.poll_viewer()
+        elif not doc.loader:
+            self.status_label.config(text=f"{doc.encoding} | {len(self.live)} of {len(self.docs)} tabs in memory")
+        doc.text.focus_set()
+
+    def hydrate(self, doc):
+        """Gives a document its Text widget, restoring the buffer it had while dormant"""
+        if doc in self.live:
+            self.live.remove(doc)
+            self.live.append(doc)
+            return
+
+        doc.text = tk.Text(doc.frame, font=("Arial", 14), undo=True, wrap="word")
+        doc.scrollbar = tk.Scrollbar(doc.frame, command=doc.text.yview)
+        doc.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        doc.text.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
+        doc.text.config(yscrollcommand=lambda first, last, d=doc: self.on_text_scroll(d, first, last))
+        doc.text.tag_config("found", background="#ffe066")
+
+        # Viewer mode scrolls by re-rendering, so these are routed through on_viewer_scroll
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>", "<Up>", "<Down>", "<Prior>", "<Next>"):
+            doc.text.bind(seq, self.on_viewer_scroll)
+        doc.text.bind("<Configure>", lambda e, d=doc: d.viewer and d.viewer.render())
+        doc.text.bind("<<Modified>>", lambda e, d=doc: self.on_modified(d))
+        self.live.append(doc)
+        if doc.language and not doc.viewer:
+            doc.highlighter = Highlighter(doc.text, doc.language)
+
+        if doc.viewer:
+            doc.viewer.attach(doc.text)
+            doc.text.config(undo=False, wrap="none", yscrollcommand="", state=tk.DISABLED)
+            doc.scrollbar.config(command=doc.viewer.yview)
+        elif doc.content is not None:
+            doc.text.insert(1.0, doc.content)
+            doc.content = None
+            doc.text.edit_reset()
+            doc.text.edit_modified(doc.modified)
+        elif doc.path:
+            self.start_load(doc)
+
+        self.evict_tabs()
+
+    def evict_tabs(self):
+        """Turns the least recently focused tabs back into plain strings"""
+        for doc in list(self.live):
+            if len(self.live) <= MAX_LIVE_TABS:
+                break
+            if doc is not self.doc and not doc.loader:
+                self.dehydrate(doc)
+
+    def dehydrate(self, doc):
+        if doc.viewer:
+            doc.viewer.attach(None)  # Keeps the mmap and line index, drops the widget
+        else:
+            doc.modified = doc.text.edit_modified()
+            # Unchanged files are read again from disk, everything else is kept as a string
+            doc.content = doc.text.get(1.0, "end-1c") if (doc.dirty or not doc.path) else None
+            if doc.modified:
+                self.queue_save("journal", doc)
+        self.remove_highlighter(doc)
+        doc.text.destroy()
+        doc.scrollbar.destroy()
+        doc.text = doc.scrollbar = None
+        self.live.remove(doc)
+
+    def close_tab(self):
+        doc = self.doc
+        if doc.dirty:
+            answer = messagebox.askyesnocancel("Notepad", f"Save changes to {doc.name}?")
+            if answer is None or (answer and not self.save_now(doc)):
+                return
+        if doc.loader:
+            self.stop_loader(doc)
+        if doc.viewer:
+            doc.viewer.close()
+        self.clear_matches()
+        self.discard_journal(doc)
+        self.remove_highlighter(doc)
+
+        self.docs.remove(doc)
+        if doc in self.live:
+            self.live.remove(doc)
+        self.doc = None
+        self.notebook.forget(doc.frame)
+        doc.frame.destroy()
+        if not self.docs:
+            self.new_file()
+        else:
+            self.on_tab_changed()
+
+    def remove_highlighter(self, doc):
+        if doc.highlighter:
+            doc.highlighter.close()
+            doc.highlighter = None
+
+    def set_language(self, doc, language):
+        """Switches a document's highlighting; dormant tabs pick it up when hydrated"""
+        doc.language = language
+        if doc.text and not doc.viewer:
+            self.remove_highlighter(doc)
+            if language:
+                doc.highlighter = Highlighter(doc.text, language)
+        if doc is self.doc:
+            self.var_language.set(language or "")
+
+    def on_language_menu(self):
+        self.set_language(self.doc, self.var_language.get() or None)
+
+    def refresh_title(self, doc):
+        star = "*" if doc.dirty else ""
+        self.notebook.tab(doc.frame, text=f"{star}{doc.name}")
+        if doc is self.doc:
+            self.root.title(f"{star}{doc.path or 'Untitled'}{doc.note} - Notepad")
+
+    def is_blank(self, doc):
+        """An untouched Untitled tab, which opening a file reuses instead of adding a tab"""
+        return (not doc.path and not doc.dirty and not doc.loader and not doc.viewer
+                and doc.text is not None and doc.text.compare("end-1c", "==", "1.0"))
 
     def new_file(self):
-        self.root.title("Untitled - Notepad")
-        self.text_area.delete(1.0, tk.END)
+        doc = self.add_document()
+        self.select(doc)
+        self.status_label.config(text="Ready")
 
     def open_file(self):
         file = filedialog.askopenfilename(defaultextension=".txt",
                                           filetypes=[("Text Documents", "*.txt"), ("All Files", "*.*")])
         if file:
-            self.root.title(f"{file} - Notepad")
-            self.text_area.delete(1.0, tk.END)
-            with open(file, "r") as f:
-                self.text_area.insert(1.0, f.read())
+            self.load_file(file)
+
+    # --- Streaming Loader ---
+
+    def load_file(self, file):
+        """Opens a file in a tab, streaming it in once the tab is focused"""
+        if self.doc and self.is_blank(self.doc):
+            self.doc.path = file
+            self.notebook.tab(self.doc.frame, text=self.doc.name)
+            self.set_language(self.doc, language_for(file))
+            self.start_load(self.doc)
+        else:
+            self.select(self.add_document(file))
+
+    def start_load(self, doc):
+        """Streams a file into the text area in chunks so the window stays responsive"""
+        doc.note = ""
+        self.refresh_title(doc)
+
+        # Undo is off while loading, otherwise every chunk lands on the undo stack.
+        # The widget stays disabled so typing cannot interleave with the chunks,
+        # but scrolling and selecting still work.
+        doc.text.config(undo=False, state=tk.NORMAL)
+        doc.text.delete(1.0, tk.END)
+        doc.text.config(state=tk.DISABLED)
+
+        try:
+            file = open(doc.path, "rb")
+            size = os.fstat(file.fileno()).st_size
+        except OSError as e:
+            # Deleted, moved or locked since the tab was opened (dormant tabs read it again)
+            doc.text.config(undo=True, state=tk.NORMAL)
+            self.load_failed(doc, e)
+            return
+        doc.loader = {
+            "file": file,
+            "size": size,
+            "read": 0,
+            "encoding": None,
+            "decoder": None,
+            "pending_cr": False,
+        }
+        self.progress["value"] = 0
+        self.show_progress(doc)
+        doc.loader_job = self.root.after_idle(self.load_next_chunk, doc)
+
+    def load_next_chunk(self, doc):
+        loader = doc.loader
+        try:
+            chunk = loader["file"].read(CHUNK_SIZE)
+        except OSError as e:
+            self.stop_loader(doc)
+            self.load_failed(doc, e)
+            return
+        final = not chunk
+        loader["read"] += len(chunk)
+
+        if loader["decoder"] is None:
+            loader["encoding"] = sniff_encoding(chunk)
+            loader["decoder"] = codecs.getincrementaldecoder(loader["encoding"])()
+
+        try:
+            text = self.decode_chunk(loader, chunk, final)
+        except UnicodeDecodeError:
+            self.restart_load(doc)
+            return
+
+        doc.text.config(state=tk.NORMAL)
+        doc.text.insert(tk.END, text)
+        doc.text.config(state=tk.DISABLED)
+
+        if final:
+            self.finish_load(doc)
+            return
+
+        if doc is self.doc:
+            percent = loader["read"] * 100 / max(loader["size"], 1)
+            self.progress["value"] = percent
+            self.status_label.config(text=f"Loading {doc.name}... {percent:.0f}%")
+        doc.loader_job = self.root.after_idle(self.load_next_chunk, doc)
+
+    def restart_load(self, doc):
+        """The file isn't valid in the sniffed encoding: reads it again from the start in
+        one that cannot fail, so the whole document is in the encoding it will be saved in"""
+        loader = doc.loader
+        loader["file"].seek(0)
+        loader["read"] = 0
+        loader["encoding"] = FALLBACK_ENCODING
+        loader["decoder"] = codecs.getincrementaldecoder(FALLBACK_ENCODING)()
+        loader["pending_cr"] = False
+        doc.text.config(state=tk.NORMAL)
+        doc.text.delete(1.0, tk.END)
+        doc.text.config(state=tk.DISABLED)
+        doc.loader_job = self.root.after_idle(self.load_next_chunk, doc)
+
+    def decode_chunk(self, loader, chunk, final):
+        """Decodes one chunk; raises UnicodeDecodeError on a byte the encoding can't take"""
+        text = loader["decoder"].decode(chunk, final)
+
+        # Translate line endings like text mode would, even when \r\n spans two chunks
+        if loader["pending_cr"]:
+            text = "\r" + text
+        loader["pending_cr"] = text.endswith("\r") and not final
+        if loader["pending_cr"]:
+            text = text[:-1]
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def finish_load(self, doc):
+        loader = doc.loader
+        self.stop_loader(doc)
+        doc.encoding = loader["encoding"]
+        doc.text.edit_reset()
+        if doc is self.doc:
+            self.status_label.config(text=f"{doc.encoding} | {loader['size']:,} bytes")
+        self.evict_tabs()  # A finished load may leave more live tabs than allowed
+
+    def cancel_load(self):
+        """Stops the focused tab's streaming load, keeping whatever was already inserted"""
+        doc = self.doc
+        if not doc.loader:
+            return
+        self.stop_loader(doc)
+        doc.path = None  # Saving must not overwrite the real file with a partial copy
+        doc.note = " [partial]"
+        self.refresh_title(doc)
+        self.status_label.config(text="Loading cancelled - partial file shown")
+
+    def load_failed(self, doc, error):
+        """Keeps the tab with what was read, detached from the file like a cancelled load"""
+        name = doc.name
+        doc.path = None  # Saving must not overwrite the real file with a partial copy
+        doc.note = " [not loaded]"
+        self.refresh_title(doc)
+        if doc is self.doc:
+            self.status_label.config(text=f"Could not read {name}: {error}")
+        messagebox.showerror("Notepad", f"Could not read {name}:\n{error}")
+
+    def stop_loader(self, doc):
+        if doc.loader_job:
+            self.root.after_cancel(doc.loader_job)
+            doc.loader_job = None
+        doc.loader["file"].close()
+        doc.loader = None
+        self.show_progress(doc)
+        doc.text.config(state=tk.NORMAL, undo=True)
+        self.mark_clean(doc)
+
+    def show_progress(self, doc):
+        """The progress bar belongs to whichever tab is focused"""
+        if doc is not self.doc:
+            return
+        if doc.loader:
+            self.progress.pack(side=tk.LEFT, padx=5)
+            self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        else:
+            self.progress.pack_forget()
+            self.cancel_btn.pack_forget()
+
+    # --- Viewer Mode ---
+
+    def open_viewer(self):
+        file = filedialog.askopenfilename(filetypes=[("Log Files", "*.log"), ("All Files", "*.*")])
+        if not file:
+            return
+        if os.path.getsize(file) == 0:
+            self.load_file(file)  # Nothing to map
+            return
+
+        doc = self.add_document(file)
+        doc.viewer = LargeFileViewer(file)
+        doc.note = " [read only]"
+        self.select(doc)
+
+    def poll_viewer(self):
+        """Keeps the scrollbar and status bar in step with the indexing thread"""
+        if self.viewer_job:
+            self.root.after_cancel(self.viewer_job)
+            self.viewer_job = None
+        if not self.viewer:
+            return
+        self.scrollbar.set(*self.viewer.scroll_fraction())
+        state = "Indexing..." if self.viewer.indexing else "Read only"
+        self.status_label.config(text=f"{state} | {self.viewer.line_count:,} lines | {self.viewer.encoding}")
+        self.viewer_job = self.root.after(200, self.poll_viewer)
+
+    def on_viewer_scroll(self, event):
+        if not self.viewer:
+            return None  # Normal Text behaviour
+        if event.num == 4 or event.keysym == "Up" or getattr(event, "delta", 0) > 0:
+            self.viewer.yview("scroll", -3 if event.keysym != "Up" else -1, "units")
+        elif event.keysym == "Prior":
+            self.viewer.yview("scroll", -1, "pages")
+        elif event.keysym == "Next":
+            self.viewer.yview("scroll", 1, "pages")
+        else:
+            self.viewer.yview("scroll", 3 if event.keysym != "Down" else 1, "units")
+        self.scrollbar.set(*self.viewer.scroll_fraction())
+        return "break"
+
+    def goto_line(self):
+        total = self.viewer.line_count if self.viewer else int(self.text_area.index("end-1c").split(".")[0])
+        line = simpledialog.askinteger("Go to Line", f"Line number (1 - {total:,}):",
+                                       parent=self.root, minvalue=1, maxvalue=total)
+        if not line:
+            return
+        if self.viewer:
+            self.viewer.goto_line(line)
+            self.scrollbar.set(*self.viewer.scroll_fraction())
+        else:
+            self.text_area.mark_set(tk.INSERT, f"{line}.0")
+            self.text_area.see(tk.INSERT)
+
+    # --- Find / Replace ---
+
+    def open_find(self):
+        if self.viewer:
+            messagebox.showinfo("Notepad", "Find is not available for files opened in the viewer.")
+            return
+        if self.find_dialog:
+            self.find_dialog.lift()
+            self.find_entry.focus_set()
+            return
+
+        self.find_dialog = tk.Toplevel(self.root)
+        self.find_dialog.title("Find / Replace")
+        self.find_dialog.transient(self.root)
+        self.find_dialog.resizable(False, False)
+        self.find_dialog.protocol("WM_DELETE_WINDOW", self.close_find)
+
+        tk.Label(self.find_dialog, text="Find:").grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.find_entry = tk.Entry(self.find_dialog, width=30)
+        self.find_entry.grid(row=0, column=1, columnspan=2, padx=5)
+        tk.Label(self.find_dialog, text="Replace:").grid(row=1, column=0, sticky="w", padx=5)
+        self.replace_entry = tk.Entry(self.find_dialog, width=30)
+        self.replace_entry.grid(row=1, column=1, columnspan=2, padx=5)
+
+        self.var_regex = tk.IntVar(value=0)
+        self.var_case = tk.IntVar(value=0)
+        tk.Checkbutton(self.find_dialog, text="Regex", variable=self.var_regex).grid(row=2, column=1, sticky="w")
+        tk.Checkbutton(self.find_dialog, text="Match case", variable=self.var_case).grid(row=2, column=2, sticky="w")
+
+        tk.Button(self.find_dialog, text="Find Next", command=lambda: self.start_search("next")).grid(row=0, column=3, sticky="ew", padx=5, pady=2)
+        tk.Button(self.find_dialog, text="Find All", command=lambda: self.start_search("all")).grid(row=1, column=3, sticky="ew", padx=5, pady=2)
+        tk.Button(self.find_dialog, text="Replace All", command=lambda: self.start_search("replace")).grid(row=2, column=3, sticky="ew", padx=5, pady=2)
+
+        self.find_status = tk.Label(self.find_dialog, text="", anchor="w", fg="#555")
+        self.find_status.grid(row=3, column=0, columnspan=4, sticky="ew", padx=5, pady=(0, 5))
+
+        self.find_entry.bind("<Return>", lambda e: self.start_search("next"))
+        self.find_entry.focus_set()
+
+    def close_find(self):
+        self.clear_matches()
+        self.find_dialog.destroy()
+        self.find_dialog = None
+
+    def start_search(self, kind):
+        """Snapshots the buffer and hands the regex work to a worker thread"""
+        query = self.find_entry.get()
+        if not query:
+            return
+        try:
+            pattern = compile_pattern(query, self.var_regex.get(), self.var_case.get())
+        except re.error as e:
+            self.find_status.config(text=f"Bad pattern: {e}")
+            return
+
+        # Find Next can reuse the last results while they still match the buffer
+        last = self.matches_pattern
+        same = last is not None and (last.pattern, last.flags) == (pattern.pattern, pattern.flags)
+        if kind == "next" and self.matches and same and self.select_next_match():
+            return
+
+        self.search_generation += 1
+        text = self.text_area.get(1.0, "end-1c")
+        replacement = self.replace_entry.get()
+        regex = bool(self.var_regex.get())
+        self.find_status.config(text="Searching...")
+        threading.Thread(target=self.search_worker,
+                         args=(self.search_generation, kind, pattern, text, replacement, regex),
+                         daemon=True).start()
+        self.root.after(20, self.poll_search)
+
+    def search_worker(self, generation, kind, pattern, text, replacement, regex):
+        try:
+            if kind == "replace":
+                result = replace_all(text, pattern, replacement, regex)
+            else:
+                result = find_matches(text, pattern)
+        except re.error as e:
+            result = e
+        self.search_results.put((generation, kind, pattern, text, result))
+
+    def poll_search(self):
+        try:
+            generation, kind, pattern, text, result = self.search_results.get_nowait()
+        except queue.Empty:
+            self.root.after(20, self.poll_search)
+            return
+        if generation != self.search_generation or not self.find_dialog:
+            return
+        if isinstance(result, re.error):
+            self.find_status.config(text=f"Bad replacement: {result}")
+        elif kind == "replace":
+            self.apply_replace(result, text)
+        else:
+            self.show_matches(result, pattern)
+            if kind == "next":
+                self.select_next_match()
+
+    def show_matches(self, matches, pattern):
+        self.clear_matches()
+        self.matches = matches
+        self.matches_pattern = pattern
+        self.find_status.config(text=f"{len(matches):,} matches")
+        self.paint_visible_matches()
+
+    def select_next_match(self):
+        """Selects the first match after the cursor, wrapping at the end"""
+        line, col = map(int, self.text_area.index(tk.INSERT).split("."))
+        i = bisect.bisect_left(self.matches, (line, col + 1))
+        if i == len(self.matches):
+            i = 0
+        l, c, el, ec = self.matches[i]
+        start, end = f"{l}.{c}", f"{el}.{ec}"
+
+        # The buffer may have been edited since the search ran
+        if not self.still_matches(self.matches[i]):
+            return False
+
+        self.text_area.tag_remove(tk.SEL, 1.0, tk.END)
+        self.text_area.tag_add(tk.SEL, start, end)
+        self.text_area.mark_set(tk.INSERT, end)
+        self.text_area.see(start)
+        self.find_status.config(text=f"Match {i + 1:,} of {len(self.matches):,}")
+        return True
+
+    def still_matches(self, match):
+        """Whether the pattern still matches exactly there, seen in its lines so anchors and lookarounds work"""
+        l, c, el, ec = match
+        lines = self.text_area.get(f"{l}.0", f"{el}.end")
+        end = (lines.rfind("\n") + 1 if el != l else 0) + ec
+        m = self.matches_pattern.match(lines, c)
+        return m is not None and m.end() == end
+
+    def on_text_scroll(self, doc, first, last):
+        doc.scrollbar.set(first, last)
+        if doc.highlighter:
+            doc.highlighter.schedule()  # Paint lines scrolled into view
+        if doc is self.doc and self.matches and not self.paint_job:
+            self.paint_job = self.root.after_idle(self.paint_visible_matches)
+
+    def paint_visible_matches(self):
+        """Tags the matches on screen with a single tag_add call"""
+        self.paint_job = None
+        top = int(self.text_area.index("@0,0").split(".")[0])
+        bottom = int(self.text_area.index(f"@0,{self.text_area.winfo_height()}").split(".")[0])
+        lo = bisect.bisect_left(self.matches, (top,))
+        hi = bisect.bisect_left(self.matches, (bottom + 1,))
+
+        ranges = []
+        for i in range(lo, hi):
+            if i not in self.painted_matches and self.still_matches(self.matches[i]):
+                l, c, el, ec = self.matches[i]
+                ranges += [f"{l}.{c}", f"{el}.{ec}"]
+                self.painted_matches.add(i)
+        if ranges:
+            self.text_area.tag_add("found", *ranges)
+
+    def clear_matches(self):
+        self.matches = []
+        self.matches_pattern = None
+        self.painted_matches = set()
+        self.text_area.tag_remove("found", 1.0, tk.END)
+
+    def apply_replace(self, result, snapshot):
+        if result is None:
+            self.find_status.config(text="No matches")
+            return
+        if self.text_area.get(1.0, "end-1c") != snapshot:
+            self.find_status.config(text="Document changed while replacing, try again")
+            return
+
+        count, (l, c), (el, ec), middle = result
+        self.clear_matches()
+
+        # One replace between two separators is one undo step however many matches changed
+        self.text_area.config(autoseparators=False)
+        self.text_area.edit_separator()
+        self.text_area.replace(f"{l}.{c}", f"{el}.{ec}", middle)
+        self.text_area.edit_separator()
+        self.text_area.config(autoseparators=True)
+        self.find_status.config(text=f"Replaced {count:,} matches")
+
+    # --- Saving ---
 
     def save_file(self):
+        if self.viewer:
+            messagebox.showinfo("Notepad", "Files opened in the viewer are read only.")
+            return
+        if self.doc.loader:
+            messagebox.showinfo("Notepad", "Wait for the file to finish loading before saving.")
+            return
+        if self.current_file:
+            self.queue_save("save", self.doc)
+        else:
+            self.save_file_as()
+
+    def save_file_as(self):
+        if self.viewer or self.doc.loader:
+            self.save_file()  # Explains why not
+            return
         file = filedialog.asksaveasfilename(initialfile="untitled.txt",
                                             defaultextension=".txt",
                                             filetypes=[("Text Documents", "*.txt"), ("All Files", "*.*")])
         if file:
-            with open(file, "w") as f:
-                f.write(self.text_area.get(1.0, tk.END))
-            self.root.title(f"{file} - Notepad")
+            self.current_file = file
+            if not self.doc.language:
+                self.set_language(self.doc, language_for(file))
+            self.queue_save("save", self.doc)
+
+    def queue_save(self, kind, doc):
+        """Snapshots the buffer on the Tk thread and leaves the disk work to the save worker"""
+        text = doc.get_text()
+        if doc.text:
+            doc.text.edit_modified(False)
+        doc.modified = False
+        self.save_jobs.put((kind, doc, doc.path, doc.encoding, text, doc.edits, time.perf_counter()))
+        if kind == "save" and doc is self.doc:
+            self.status_label.config(text="Saving...")
+
+    def save_worker(self):
+        """Runs the writes one at a time, in the order they were queued"""
+        while True:
+            kind, doc, path, encoding, text, edits, started = self.save_jobs.get()
+            try:
+                if kind == "save":
+                    atomic_write(path, text, encoding)
+                else:
+                    write_journal(doc.journal_path, path, encoding, text)
+                error = None
+            except (OSError, UnicodeError) as e:
+                error = e
+            self.save_results.put((kind, doc, edits, error, time.perf_counter() - started))
+            self.save_jobs.task_done()
+
+    def poll_saves(self):
+        if not self.root.winfo_exists():
+            return  # Window closed (under the launcher the process lives on)
+        try:
+            while True:
+                kind, doc, edits, error, elapsed = self.save_results.get_nowait()
+                self.finish_save(kind, doc, edits, error, elapsed)
+        except queue.Empty:
+            pass
+        self.root.after(100, self.poll_saves)
+
+    def finish_save(self, kind, doc, edits, error, elapsed):
+        if doc not in self.docs:
+            return  # Tab was closed meanwhile
+        if error:
+            # Still needs writing
+            doc.modified = True
+            if doc.text:
+                doc.text.edit_modified(True)
+            self.status_label.config(text=f"{'Save' if kind == 'save' else 'Autosave'} failed: {error}")
+            return
+
+        stamp = time.strftime("%H:%M:%S")
+        if kind == "save":
+            # The modified flag is also cleared by journal writes, so it can't tell whether
+            # the buffer changed after this save was queued; the edit count can
+            if doc.edits == edits:
+                doc.dirty = False
+                self.discard_journal(doc)
+            doc.note = ""
+            self.refresh_title(doc)
+            self.status_label.config(text=f"Saved {doc.name} {stamp} in {elapsed * 1000:.0f} ms | {doc.encoding}")
+        else:
+            self.status_label.config(text=f"Autosaved {doc.name} {stamp} in {elapsed * 1000:.0f} ms | {doc.encoding}")
+
+    def autosave(self):
+        """Journals the live buffers that changed since their last save or journal write.
+
+        Dormant tabs were journaled when they were put to sleep.
+        """
+        if not self.root.winfo_exists():
+            return
+        for doc in self.live:
+            if doc.text.edit_modified() and not doc.loader and not doc.viewer:
+                self.queue_save("journal", doc)
+        self.root.after(AUTOSAVE_MS, self.autosave)
+
+    def on_modified(self, doc):
+        if doc.text.edit_modified():
+            doc.edits += 1
+        if doc is self.doc and self.matches and doc.text.edit_modified():
+            self.clear_matches()  # Offsets are stale once the buffer changes
+        if doc.text.edit_modified() and not doc.loader and not doc.viewer and not doc.dirty:
+            doc.dirty = True
+            self.refresh_title(doc)
+
+    def mark_clean(self, doc):
+        doc.text.edit_modified(False)
+        doc.modified = False
+        doc.dirty = False
+
+    def discard_journal(self, doc):
+        try:
+            os.remove(doc.journal_path)
+        except FileNotFoundError:
+            pass
+
+    def offer_recovery(self):
+        """Offers to restore buffers journaled by a Notepad that did not exit cleanly"""
+        for journal, header in orphaned_journals():
+            name = header.get("path") or "Untitled"
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(header.get("time", 0)))
+            if messagebox.askyesno("Recover", f"Recover unsaved changes to {name} from {when}?"):
+                _, text = read_journal(journal)
+                doc = self.add_document(header.get("path"))
+                doc.content = text
+                doc.encoding = header.get("encoding", "utf-8")
+                doc.dirty = doc.modified = True
+                doc.note = " [recovered]"
+                self.select(doc)
+            os.remove(journal)
+
+    def save_now(self, doc):
+        """Synchronous save used when closing, returns False if the user backed out"""
+        path = doc.path or filedialog.asksaveasfilename(initialfile="untitled.txt", defaultextension=".txt")
+        if not path:
+            return False
+        try:
+            atomic_write(path, doc.get_text(), doc.encoding)
+        except (OSError, UnicodeError) as e:
+            # Same message as a failed background save; the tab stays open and dirty
+            self.status_label.config(text=f"Save failed: {e}")
+            messagebox.showerror("Notepad", f"Could not save {doc.name}:\n{e}")
+            return False
+        return True
+
+    def exit_app(self):
+        for doc in [d for d in self.docs if d.dirty]:
+            self.select(doc)
+            answer = messagebox.askyesnocancel("Notepad", f"Save changes to {doc.name}?")
+            if answer is None or (answer and not self.save_now(doc)):
+                return
+        self.save_jobs.join()  # Let queued saves land before the worker thread dies with us
+        for doc in self.docs:
+            self.discard_journal(doc)
+        self.root.destroy()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,5 +1,15 @@
+import queue
+import threading
 import tkinter as tk
-from tkinter import colorchooser
+from tkinter import colorchooser, filedialog, messagebox
+from PIL import ImageTk
+from image_viewer import Pyramid
+
+PAGE_SIZE = 3000          # Scrollregion of a page at 100%
+IMAGE_RENDER_MS = 80      # Re-render an imported image once zooming/scrolling pauses this long
+IMAGE_MARGIN = 0.5        # Extra fraction of the view rendered on each side, for scrolling
+IMAGE_POLL_MS = 15
+IMAGE_TYPES = [("Images", "*.png *.jpg *.jpeg *.gif *.bmp *.webp *.tif *.tiff")]
 
 class PaintApp:
     def __init__(self, root):
@@ -18,6 +28,12 @@ class PaintApp:
         self.pages = []       
         self.current_page = 0 
         self.zoom_scale = 1.0
+
+        # Imported images are rendered off the Tk thread; only the newest render is shown
+        self.renders = queue.Queue()
+        self.render_job = None
+        self.render_generation = 0
+        self.renders_pending = 0
         
         # --- UI Layout ---
         self.create_top_toolbar()
@@ -36,6 +52,7 @@ class PaintApp:
 
         tk.Button(toolbar, text="Color", command=self.choose_color, bg="white").pack(side=tk.LEFT, padx=5, pady=5)
         tk.Button(toolbar, text="Eraser", command=self.use_eraser, bg="white").pack(side=tk.LEFT, padx=5)
+        tk.Button(toolbar, text="Image", command=self.import_image, bg="white").pack(side=tk.LEFT, padx=5)
         
         tk.Label(toolbar, text="Size:", bg="#e0e0e0").pack(side=tk.LEFT, padx=(10,0))
         self.size_slider = tk.Scale(toolbar, from_=1, to=50, orient=tk.HORIZONTAL, command=self.change_size, bg="#e0e0e0")
@@ -66,11 +83,12 @@ class PaintApp:
         h_bar = tk.Scrollbar(frame, orient=tk.HORIZONTAL)
 
         # Huge scrollregion to support massive zooming
-        canvas = tk.Canvas(frame, bg="white", scrollregion=(0, 0, 3000, 3000),
+        canvas = tk.Canvas(frame, bg="white", scrollregion=(0, 0, PAGE_SIZE, PAGE_SIZE),
                            yscrollcommand=v_bar.set, xscrollcommand=h_bar.set)
         
-        v_bar.config(command=canvas.yview)
-        h_bar.config(command=canvas.xview)
+        v_bar.config(command=lambda *args: self.scroll(canvas.yview, args))
+        h_bar.config(command=lambda *args: self.scroll(canvas.xview, args))
+        canvas.bind('<Configure>', lambda e: self.schedule_image_render())
 
         canvas.grid(row=0, column=0, sticky="nsew")
         v_bar.grid(row=0, column=1, sticky="ns")
@@ -101,6 +119,7 @@ class PaintApp:
             # Reset zoom when switching pages (optional, but cleaner)
             self.zoom_scale = 1.0
             self.lbl_zoom.config(text="100%")
+            self.schedule_image_render()
 
     def prev_page(self): self.switch_to_page(self.current_page - 1)
     def next_page(self): self.switch_to_page(self.current_page + 1)
@@ -184,10 +203,89 @@ class PaintApp:
         
         # 4. Update Scroll Region
         # We assume the base page is 2000x2000. We scale the scrollable area.
-        new_region = 3000 * self.zoom_scale
+        new_region = PAGE_SIZE * self.zoom_scale
         c.configure(scrollregion=(0, 0, new_region, new_region))
         
         self.lbl_zoom.config(text=f"{int(self.zoom_scale * 100)}%")
+        self.schedule_image_render()
+
+    def scroll(self, view, args):
+        view(*args)
+        self.schedule_image_render()
+
+    # --- Imported Images ---
+    # The image is drawn from a tile pyramid (image_viewer.Pyramid), so only the
+    # part in view is decoded, at the resolution the current zoom needs.
+
+    def import_image(self):
+        path = filedialog.askopenfilename(filetypes=IMAGE_TYPES)
+        if not path: return
+        page = self.pages[self.current_page]
+        old = page.get("image")
+        if old and old["item"]: page["canvas"].delete(old["item"])
+        page["image"] = {"pyramid": Pyramid(path), "item": None, "photo": None}
+        self.render_generation += 1  # Drop renders of the image this one replaces
+        self.schedule_image_render()
+
+    def schedule_image_render(self):
+        if self.render_job: self.root.after_cancel(self.render_job)
+        self.render_job = self.root.after(IMAGE_RENDER_MS, self.render_image)
+
+    def render_image(self):
+        self.render_job = None
+        page = self.pages[self.current_page]
+        if not page.get("image"): return
+        c = page["canvas"]
+        w, h = c.winfo_width(), c.winfo_height()
+        view = (c.canvasx(0) - w * IMAGE_MARGIN, c.canvasy(0) - h * IMAGE_MARGIN,
+                c.canvasx(w) + w * IMAGE_MARGIN, c.canvasy(h) + h * IMAGE_MARGIN)
+        self.render_generation += 1
+        self.renders_pending += 1
+        threading.Thread(target=self.render_region, daemon=True,
+                         args=(page, view, self.zoom_scale, self.render_generation)).start()
+        if self.renders_pending == 1: self.root.after(IMAGE_POLL_MS, self.poll_renders)
+
+    def render_region(self, page, view, zoom, generation):
+        """Worker thread: the part of the image inside view, at zoom; the image fits the page at 100%"""
+        try:
+            width, height = page["image"]["pyramid"].build().size
+            scale = min(1.0, PAGE_SIZE / max(width, height)) * zoom   # Canvas pixels per image pixel
+            x0, y0 = max(0, view[0]), max(0, view[1])
+            x1, y1 = min(width * scale, view[2]), min(height * scale, view[3])
+            img = None
+            if x1 - x0 >= 1 and y1 - y0 >= 1:
+                img = page["image"]["pyramid"].region((x0 / scale, y0 / scale, x1 / scale, y1 / scale),
+                                                      (round(x1 - x0), round(y1 - y0)))
+            self.renders.put((generation, page, (x0, y0), img, None))
+        except (OSError, ValueError) as e:
+            self.renders.put((generation, page, None, None, e))
+
+    def poll_renders(self):
+        while True:
+            try:
+                generation, page, pos, img, error = self.renders.get_nowait()
+            except queue.Empty:
+                break
+            self.renders_pending -= 1
+            image = page.get("image")
+            if generation != self.render_generation or not image:
+                continue  # Zoomed or scrolled again since; a newer render is on its way
+            c = page["canvas"]
+            if error:
+                page["image"] = None
+                if image["item"]: c.delete(image["item"])
+                messagebox.showerror("Image", f"Could not open image:\n{error}")
+            elif img is None:
+                if image["item"]: c.itemconfig(image["item"], state=tk.HIDDEN)  # Scrolled off the image
+            else:
+                image["photo"] = ImageTk.PhotoImage(img)
+                if image["item"]:
+                    c.coords(image["item"], *pos)
+                    c.itemconfig(image["item"], image=image["photo"], state=tk.NORMAL)
+                else:
+                    image["item"] = c.create_image(*pos, image=image["photo"], anchor=tk.NW)
+                    c.tag_lower(image["item"])  # Under the strokes
+        if self.renders_pending: self.root.after(IMAGE_POLL_MS, self.poll_renders)
 
     # --- Tools ---
 
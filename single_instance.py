@@ -0,0 +1,135 @@
+"""Single-instance support: later launches hand their argv to the running process.
+
+The first process binds a Unix socket and becomes the server. A later launch
+connects, sends one JSON line {"argv": [...], "cwd": "..."}, waits for "ok"
+and exits, so it never has to start Tk at all. Messages are queued by a
+listener thread and handed to the Tk thread with after(), like every other
+worker in these apps.
+
+    server = claim()                  # None: another instance is running
+    if server is None and forward(sys.argv[1:]):
+        sys.exit()
+"""
+import json
+import os
+import queue
+import socket
+import tempfile
+import threading
+
+FORWARD_TIMEOUT = 1.0      # Seconds a launch waits for the running instance to answer
+MAX_MESSAGE = 1 << 20      # Bytes; argv is small, anything bigger is not ours
+POLL_MS = 50
+
+def socket_path(name="launcher"):
+    """Per-user socket, in XDG_RUNTIME_DIR when there is one (it is private to the user)"""
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    return os.path.join(base, f"tkinter-apps-{name}-{uid}.sock")
+
+def supported():
+    return hasattr(socket, "AF_UNIX")
+
+def forward(argv, path=None, timeout=FORWARD_TIMEOUT):
+    """Sends argv to a running instance; True if it accepted them"""
+    if not supported():
+        return False
+    message = json.dumps({"argv": list(argv), "cwd": os.getcwd()}).encode("utf-8") + b"\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path or socket_path())
+            sock.sendall(message)
+            return sock.makefile("rb").readline().strip() == b"ok"
+    except OSError:
+        return False  # Nobody listening (or a stale socket file)
+
+class InstanceServer:
+    """Listens on the socket and hands each (argv, cwd) to handler on the Tk thread"""
+
+    def __init__(self, sock, path):
+        self.sock = sock
+        self.path = path
+        self.messages = queue.Queue()
+        self.handler = None
+        self.root = None
+        threading.Thread(target=self.listen, daemon=True).start()
+
+    def listen(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return  # Socket closed
+            with conn:
+                try:
+                    conn.settimeout(FORWARD_TIMEOUT)
+                    line = conn.makefile("rb").readline(MAX_MESSAGE)
+                    message = json.loads(line)
+                    argv, cwd = [str(a) for a in message["argv"]], str(message["cwd"])
+                except (OSError, ValueError, KeyError, TypeError):
+                    continue  # Not one of ours; drop it
+                self.messages.put((argv, cwd))
+                try:
+                    conn.sendall(b"ok\n")
+                except OSError:
+                    pass
+
+    def attach(self, root, handler):
+        """Starts delivering messages to handler(argv, cwd) through root.after"""
+        self.root = root
+        self.handler = handler
+        self.poll()
+
+    def poll(self):
+        try:
+            while True:
+                argv, cwd = self.messages.get_nowait()
+                self.handler(argv, cwd)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll)
+
+    def close(self):
+        try:
+            self.sock.close()
+        finally:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+def claim(path=None):
+    """Binds the instance socket; returns an InstanceServer, or None if another process has it"""
+    if not supported():
+        return None
+    path = path or socket_path()
+    for _ in range(2):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Created owner-only: chmod after bind would leave a window where others could connect
+        umask = os.umask(0o177)
+        try:
+            sock.bind(path)
+        except OSError:
+            sock.close()
+            if is_alive(path):
+                return None
+            # Left behind by a process that crashed; take it over
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            continue
+        finally:
+            os.umask(umask)
+        sock.listen(16)   # Right after bind, so a racing launch never sees a dead socket
+        return InstanceServer(sock, path)
+    return None
+
+def is_alive(path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+            return True
+        except OSError:
+            return False
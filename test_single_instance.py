@@ -0,0 +1,100 @@
+"""Socket-level tests for single_instance; everything runs on a socket in a temp dir.
+
+    python -m unittest test_single_instance
+"""
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import unittest
+
+import single_instance
+
+class FakeRoot:
+    """Records after() calls instead of running a Tk loop"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, fn):
+        self.scheduled.append((ms, fn))
+
+@unittest.skipUnless(single_instance.supported(), "needs AF_UNIX sockets")
+class SingleInstanceTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "test.sock")
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.close()
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def claim(self):
+        server = single_instance.claim(self.path)
+        if server:
+            self.servers.append(server)
+        return server
+
+    def test_first_claim_wins(self):
+        self.assertIsNotNone(self.claim())
+        self.assertIsNone(self.claim())
+
+    def test_socket_is_private(self):
+        self.claim()
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_forward_delivers_argv_and_cwd(self):
+        server = self.claim()
+        self.assertTrue(single_instance.forward(["a.txt", "--new"], path=self.path))
+        argv, cwd = server.messages.get(timeout=1)
+        self.assertEqual(argv, ["a.txt", "--new"])
+        self.assertEqual(cwd, os.getcwd())
+
+    def test_attach_hands_messages_to_handler(self):
+        server = self.claim()
+        # "ok" is only sent once the message is queued, so it is waiting by now
+        self.assertTrue(single_instance.forward(["b.txt"], path=self.path))
+        received = []
+        root = FakeRoot()
+        server.attach(root, lambda argv, cwd: received.append(argv))
+        self.assertEqual(received, [["b.txt"]])
+        self.assertEqual(root.scheduled[-1][0], single_instance.POLL_MS)
+
+    def test_forward_without_server(self):
+        self.assertFalse(single_instance.forward(["x"], path=self.path))
+
+    def test_stale_socket_is_taken_over(self):
+        # A crashed instance leaves its socket file with nobody listening on it
+        dead = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        dead.bind(self.path)
+        dead.close()
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(single_instance.forward(["x"], path=self.path))
+        server = self.claim()
+        self.assertIsNotNone(server)
+        self.assertTrue(single_instance.forward(["y"], path=self.path))
+        self.assertEqual(server.messages.get(timeout=1)[0], ["y"])
+
+    def test_garbage_is_dropped(self):
+        server = self.claim()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            sock.connect(self.path)
+            sock.sendall(b"not json\n")
+            self.assertEqual(sock.makefile("rb").readline(), b"")  # Closed without "ok"
+        self.assertTrue(single_instance.forward(["z"], path=self.path))
+        self.assertEqual(server.messages.get(timeout=1)[0], ["z"])
+
+    def test_close_releases_socket(self):
+        server = self.claim()
+        server.close()
+        self.servers.remove(server)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(single_instance.forward(["x"], path=self.path))
+        self.assertIsNotNone(self.claim())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+"""Tests for tk_asyncio's AsyncBridge, with a stand-in for the Tk root.
+
+    python -m unittest test_tk_asyncio
+"""
+import asyncio
+import time
+import unittest
+
+import tk_asyncio
+
+def spin(seconds):
+    """Pure-Python busy work for the process pool"""
+    end = time.monotonic() + seconds
+    n = 0
+    while time.monotonic() < end:
+        n += 1
+    return n
+
+class FakeRoot:
+    """Holds after() jobs until run_pending() and records reported exceptions"""
+
+    def __init__(self):
+        self.scheduled = {}
+        self.next_id = 0
+        self.reported = []
+
+    def after(self, ms, fn):
+        self.next_id += 1
+        self.scheduled[self.next_id] = (ms, fn)
+        return self.next_id
+
+    def after_cancel(self, job):
+        self.scheduled.pop(job, None)
+
+    def report_callback_exception(self, kind, value, tb):
+        self.reported.append(value)
+
+    def run_pending(self):
+        jobs, self.scheduled = self.scheduled, {}
+        for ms, fn in jobs.values():
+            fn()
+
+class AsyncBridgeTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.bridge = tk_asyncio.AsyncBridge(self.root)
+
+    def tearDown(self):
+        self.bridge.close()
+        self.assertFalse(self.bridge.thread.is_alive())
+
+    @classmethod
+    def tearDownClass(cls):
+        if tk_asyncio._cpu_pool is not None:
+            tk_asyncio._cpu_pool.shutdown()
+            tk_asyncio._cpu_pool = None
+
+    def pump(self, done, timeout=5.0):
+        """Plays the Tk loop until done() is true"""
+        deadline = time.monotonic() + timeout
+        while not done():
+            self.assertLess(time.monotonic(), deadline, "timed out waiting for the bridge")
+            self.root.run_pending()
+            time.sleep(0.005)
+
+    def test_submit_delivers_result_on_poll(self):
+        async def answer():
+            return 42
+        results = []
+        self.bridge.submit(answer(), lambda result, error: results.append((result, error)))
+        self.pump(lambda: results)
+        self.assertEqual(results, [(42, None)])
+
+    def test_submit_delivers_error(self):
+        async def fail():
+            raise ValueError("bad")
+        results = []
+        self.bridge.submit(fail(), lambda result, error: results.append((result, error)))
+        self.pump(lambda: results)
+        self.assertIsNone(results[0][0])
+        self.assertIsInstance(results[0][1], ValueError)
+
+    def test_cancel_reports_cancelled(self):
+        results = []
+        future = self.bridge.submit(asyncio.sleep(10), lambda result, error: results.append(error))
+        future.cancel()
+        self.pump(lambda: results)
+        self.assertIsInstance(results[0], asyncio.CancelledError)
+
+    def test_raising_callback_is_reported_and_delivery_continues(self):
+        async def value(n):
+            return n
+        def explode(result, error):
+            raise RuntimeError("callback failed")
+        results = []
+        self.bridge.submit(value(1), explode)
+        self.pump(lambda: self.root.reported)
+        self.bridge.submit(value(2), lambda result, error: results.append(result))
+        self.pump(lambda: results)
+        self.assertIsInstance(self.root.reported[0], RuntimeError)
+        self.assertEqual(results, [2])
+        self.assertTrue(self.root.scheduled)   # Still polling
+
+    def test_in_tk_runs_on_polling_thread(self):
+        async def ask():
+            return await self.bridge.in_tk(lambda a, b: a + b, 2, 3)
+        results = []
+        self.bridge.submit(ask(), lambda result, error: results.append(result))
+        self.pump(lambda: results)
+        self.assertEqual(results, [5])
+
+    def test_loop_stays_responsive_while_cpu_pool_is_busy(self):
+        async def busy_and_ticking():
+            loop = asyncio.get_running_loop()
+            work = asyncio.ensure_future(tk_asyncio.run_cpu(spin, 1.0))
+            worst = 0.0
+            while not work.done():
+                start = loop.time()
+                await asyncio.sleep(0.01)
+                worst = max(worst, loop.time() - start - 0.01)
+            return await work, worst
+        results = []
+        self.bridge.submit(busy_and_ticking(), lambda result, error: results.append((result, error)))
+        self.pump(lambda: results, timeout=30)
+        (count, worst), error = results[0]
+        self.assertIsNone(error)
+        self.assertGreater(count, 0)
+        self.assertLess(worst, 0.1)
+
+if __name__ == "__main__":
+    unittest.main()
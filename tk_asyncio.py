@@ -0,0 +1,148 @@
+"""Run asyncio next to Tk: the loop lives on its own thread, results come back through after().
+
+Tk must only be touched from the thread running mainloop, and mainloop can't
+be an asyncio loop, so the bridge keeps them apart: coroutines run on a
+dedicated loop thread, and anything meant for Tk goes through a queue that the
+Tk thread drains every POLL_MS, like the other workers in these apps.
+
+    bridge = AsyncBridge(root)
+    bridge.submit(read_file(path), lambda data, error: show(data))
+
+    async def refresh():
+        code, out, err = await run_process("git", "status", "--short")
+        await bridge.in_tk(status.config, text=out.decode())
+
+Blocking calls (file reads, decoding) go to the loop's thread pool with
+run_blocking; CPU-heavy pure-Python work can go to a process pool with
+run_cpu so it doesn't hold the GIL against the Tk thread.
+"""
+import asyncio
+import concurrent.futures
+import queue
+import sys
+import threading
+import traceback
+
+POLL_MS = 10              # How often the Tk thread picks up results
+MAX_CALLS_PER_POLL = 200  # So a flood of results can't stall one Tk frame
+CPU_WORKERS = None        # Process pool size for run_cpu; None = CPU count
+
+_cpu_pool = None
+
+# ================= HELPERS (await these on the bridge loop) =================
+
+async def run_blocking(fn, *args):
+    """fn(*args) on the loop's thread pool"""
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+async def run_cpu(fn, *args):
+    """fn(*args) in a worker process; fn and args must pickle"""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = concurrent.futures.ProcessPoolExecutor(CPU_WORKERS)
+    return await asyncio.get_running_loop().run_in_executor(_cpu_pool, fn, *args)
+
+def _read(path, binary):
+    with open(path, "rb" if binary else "r", **({} if binary else {"encoding": "utf-8"})) as f:
+        return f.read()
+
+async def read_file(path, binary=True):
+    return await run_blocking(_read, path, binary)
+
+async def run_process(*cmd, stdin=None, timeout=None, cwd=None):
+    """Runs cmd and returns (returncode, stdout bytes, stderr bytes); kills it on timeout"""
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, cwd=cwd, stdin=asyncio.subprocess.PIPE if stdin is not None else None,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(stdin), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return proc.returncode, out, err
+
+# ================= BRIDGE =================
+
+class AsyncBridge:
+    def __init__(self, root, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.calls = queue.Queue()      # (fn, args) to run on the Tk thread
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.run_loop, daemon=True)
+        self.thread.start()
+        self.job = self.root.after(self.poll_ms, self.poll)
+
+    def run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    # --- Tk thread -> loop ---
+    def submit(self, coro, callback=None):
+        """Schedules coro on the loop; callback(result, error) runs on the Tk thread"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if callback:
+            def done(f):
+                if f.cancelled():
+                    self.call_in_tk(callback, None, asyncio.CancelledError())
+                elif f.exception() is not None:
+                    self.call_in_tk(callback, None, f.exception())
+                else:
+                    self.call_in_tk(callback, f.result(), None)
+            future.add_done_callback(done)
+        return future
+
+    # --- loop (or any thread) -> Tk thread ---
+    def call_in_tk(self, fn, *args):
+        """Runs fn(*args) on the Tk thread soon; safe from any thread"""
+        self.calls.put((fn, args))
+
+    async def in_tk(self, fn, *args, **kwargs):
+        """Awaitable from a coroutine: runs fn on the Tk thread and returns its result"""
+        future = self.loop.create_future()
+        def deliver(result, error):
+            if not future.done():
+                if error is not None: future.set_exception(error)
+                else: future.set_result(result)
+        def call():
+            try:
+                result, error = fn(*args, **kwargs), None
+            except Exception as e:
+                result, error = None, e
+            self.loop.call_soon_threadsafe(deliver, result, error)
+        self.calls.put((call, ()))
+        return await future
+
+    def poll(self):
+        self.job = None
+        try:
+            for _ in range(MAX_CALLS_PER_POLL):
+                try:
+                    fn, args = self.calls.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    fn(*args)
+                except Exception:
+                    self.report_error()  # One failing callback must not stop delivery of the rest
+        finally:
+            # Come straight back if there is a backlog, otherwise at the normal rate
+            self.job = self.root.after(1 if not self.calls.empty() else self.poll_ms, self.poll)
+
+    def report_error(self):
+        """Shows the exception the way Tk shows one from an ordinary callback"""
+        report = getattr(self.root, "report_callback_exception", None)
+        if report is None:
+            report = getattr(self.root.winfo_toplevel(), "report_callback_exception", None)
+        if report:
+            report(*sys.exc_info())
+        else:
+            traceback.print_exc()
+
+    def close(self):
+        if self.job:
+            self.root.after_cancel(self.job)
+            self.job = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=1.0)
@@ -0,0 +1,226 @@
+"""Animated wallpapers for the desktop canvas.
+
+A wallpaper is a still image, an animated GIF/APNG/WebP, or a folder of images
+shown as a slideshow. A producer thread decodes and scales frames ahead of
+time into a small bounded queue; the Tk side only pastes ready frames into a
+single PhotoImage. Every frame has a due time on a wall-clock timeline, and a
+frame whose successor is already due is skipped on both sides of the queue,
+so a busy UI drops frames instead of falling behind. Memory stays at
+QUEUE_FRAMES scaled frames however long the sequence is.
+
+    player = WallpaperPlayer(canvas, (width, height))
+    player.start("loop.gif")
+"""
+import os
+import queue
+import threading
+import time
+from PIL import Image, ImageSequence, ImageTk
+from image_viewer import Pyramid
+
+# --- Playback Settings ---
+QUEUE_FRAMES = 2              # Scaled frames decoded ahead; the memory cap
+DEFAULT_DELAY_MS = 100        # For animations that don't say
+MIN_DELAY_MS = 20             # Browsers clamp tiny GIF delays the same way
+SLIDESHOW_DELAY_MS = 8000
+IDLE_POLL_MS = 30             # How often the canvas looks for a frame when none is queued
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+PYRAMID_PIXELS = 6000 * 6000  # Stills bigger than this are read through a cached tile pyramid
+
+def is_animated(path):
+    try:
+        with Image.open(path) as img:
+            return getattr(img, "is_animated", False)
+    except Image.DecompressionBombError:
+        return False  # Too big for PIL's guard; open_still reads it through a pyramid
+
+def folder_images(folder):
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+            if name.lower().endswith(IMAGE_EXTENSIONS)]
+
+def open_still(path, size=None):
+    """A still image; a huge one comes back already at size, stitched from its pyramid's tiles.
+    JPEGs don't need this: draft() lets their decoder skip to a small size."""
+    try:
+        img = Image.open(path)
+    except Image.DecompressionBombError as e:
+        if not size:
+            raise ValueError(str(e))
+        return Pyramid(path).image_at(size)  # Past PIL's guard; the pyramid opens it with a raised limit
+    if size and img.format != "JPEG" and img.width * img.height > PYRAMID_PIXELS:
+        img.close()
+        return Pyramid(path).image_at(size)
+    return img
+
+def frame_source(path, size=None, stopped=None):
+    """Yields (PIL image, delay ms, smooth) forever; the delay of a still image is None.
+
+    Nothing is kept between frames: animations are re-read from the file on each
+    loop and slideshows open one file at a time. Setting the stopped Event ends
+    a slideshow even while it is skipping files that won't open.
+    """
+    if os.path.isdir(path):
+        paths = folder_images(path)
+        if not paths:
+            raise ValueError(f"no images in {path}")
+        while True:
+            shown = False
+            for image_path in paths:
+                if stopped and stopped.is_set():
+                    return
+                try:
+                    img = open_still(image_path, size)
+                except OSError:
+                    continue  # Deleted or not an image after all; show the next one
+                shown = True
+                with img:
+                    yield img, SLIDESHOW_DELAY_MS if len(paths) > 1 else None, True
+            if not shown:
+                raise ValueError(f"no readable images in {path}")
+        return
+    if not is_animated(path):
+        with open_still(path, size) as img:
+            yield img, None, True
+        return
+    while True:
+        with Image.open(path) as img:
+            for frame in ImageSequence.Iterator(img):
+                delay = frame.info.get("duration") or DEFAULT_DELAY_MS
+                yield frame, max(MIN_DELAY_MS, int(delay)), False
+
+def scale(img, size, smooth=True):
+    """Covers size with the image. Animation frames use BILINEAR: LANCZOS costs
+    several times more per frame and the difference doesn't show in motion."""
+    if smooth and img.format == "JPEG":
+        img.draft("RGB", size)  # Let the decoder downscale by 2/4/8 for free
+    img = img.convert("RGB")
+    if img.size == size:
+        return img
+    resample = Image.Resampling.LANCZOS if smooth else Image.Resampling.BILINEAR
+    return img.resize(size, resample)
+
+class FramePipeline:
+    """The producer thread and the frame-dropping queue, without any Tk"""
+
+    def __init__(self, path, size, clock=time.perf_counter):
+        self.size = size
+        self.clock = clock
+        self.frames = queue.Queue(maxsize=QUEUE_FRAMES)
+        self.stopped = threading.Event()
+        self.finished = False     # Producer is done (a still image, or a bad file)
+        self.error = None
+        self.decoded = 0          # Frames scaled by the producer
+        self.skipped = 0          # Frames the producer skipped without scaling
+        self.dropped = 0          # Scaled frames the consumer threw away
+        self.start_time = clock()
+        self.thread = threading.Thread(target=self.produce, args=(path,), daemon=True)
+        self.thread.start()
+
+    def produce(self, path):
+        due = self.start_time
+        try:
+            for img, delay, smooth in frame_source(path, self.size, self.stopped):
+                if self.stopped.is_set():
+                    return
+                if delay is not None and due + delay / 1000 <= self.clock():
+                    self.skipped += 1  # The next frame is already due; don't scale this one
+                else:
+                    frame = scale(img, self.size, smooth)
+                    self.decoded += 1
+                    if not self.put((due, frame)):
+                        return
+                if delay is None:
+                    break
+                due += delay / 1000
+        except (OSError, ValueError) as e:
+            self.error = e
+        finally:
+            self.finished = True
+
+    def put(self, item):
+        while not self.stopped.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def take(self):
+        """Returns (frame or None, seconds until the next frame is due or None).
+
+        Of all the frames that are due, only the newest is returned.
+        """
+        now = self.clock()
+        shown = None
+        while True:
+            try:
+                due, frame = self.frames.queue[0]
+            except IndexError:
+                return shown, None
+            if due > now:
+                return shown, due - now
+            self.frames.get_nowait()
+            if shown is not None:
+                self.dropped += 1
+            shown = frame
+
+    def done(self):
+        return self.finished and self.frames.empty()
+
+    def stop(self):
+        self.stopped.set()
+
+class WallpaperPlayer:
+    """Shows a FramePipeline on a canvas, pasting into one reused PhotoImage"""
+
+    def __init__(self, canvas, size, on_error=None):
+        self.canvas = canvas
+        self.size = size
+        self.on_error = on_error
+        self.pipeline = None
+        self.photo = None
+        self.item = None
+        self.job = None
+        self.shown = 0
+
+    def start(self, path):
+        self.stop()
+        self.shown = 0
+        self.pipeline = FramePipeline(path, self.size)
+        self.tick()
+
+    def tick(self):
+        self.job = None
+        pipeline = self.pipeline
+        frame, wait = pipeline.take()
+        if frame is not None:
+            self.show(frame)
+        if pipeline.done():
+            # Still image shown (or the file failed); nothing left to schedule
+            if pipeline.error and self.on_error:
+                self.on_error(pipeline.error)
+            return
+        delay = IDLE_POLL_MS if wait is None else max(1, int(wait * 1000))
+        self.job = self.canvas.after(delay, self.tick)
+
+    def show(self, frame):
+        if self.photo is None:
+            self.photo = ImageTk.PhotoImage(frame)
+            self.item = self.canvas.create_image(0, 0, image=self.photo, anchor="nw")
+            self.canvas.tag_lower(self.item)
+        else:
+            self.photo.paste(frame)  # Reuses the Tk image instead of allocating one per frame
+        self.shown += 1
+
+    def nbytes(self):
+        """Most the player can hold: the queued RGB frames, one being scaled, and the RGBA PhotoImage"""
+        width, height = self.size
+        return width * height * (3 * (QUEUE_FRAMES + 1) + 4)
+
+    def stop(self):
+        if self.job:
+            self.canvas.after_cancel(self.job)
+            self.job = None
+        if self.pipeline:
+            self.pipeline.stop()
@@ -0,0 +1,168 @@
+"""Geometry, stacking and minimize for place()-managed panels inside one container.
+
+The manager keeps each panel's x, y, width and height and the stacking order
+itself, so dragging never has to ask Tk where a window is. Motion events only
+record the latest pointer position. One place() per frame applies it, with
+snapping to the container edges and to other panels. Panels are told when
+they are hidden or shown (set_visible), so they can pause their timers.
+
+    wm = WindowManager(root, width, height)
+    wm.manage(panel, x, y, w, h)
+    title_bar.bind("<Button-1>", lambda e: wm.start_drag(panel, e))
+"""
+import tkinter as tk
+
+FRAME_MS = 16             # One place() per frame while dragging
+SNAP_PX = 12              # Edges closer than this stick together
+TASKBAR_H = 30
+
+class WindowManager:
+    def __init__(self, container, width, height):
+        self.container = container
+        self.width = width
+        self.height = height
+        self.geometry = {}        # panel -> [x, y, width, height]
+        self.stack = []           # Bottom to top, visible panels only
+        self.minimized = {}       # panel -> its taskbar button
+        self.drag = None          # (panel, pointer x, pointer y, panel x, panel y) at press
+        self.pending = None       # (panel, x, y) waiting for the next frame
+        self.job = None
+        self.taskbar = None
+        self.places = 0           # place() calls made for moves, for benchmarks
+
+    # --- Registration ---
+    def manage(self, panel, x, y, width, height):
+        self.geometry[panel] = [x, y, width, height]
+        self.place(panel)
+        self.stack.append(panel)  # A new widget is already on top
+
+    def forget(self, panel):
+        if self.drag and self.drag[0] is panel:
+            self.drag = self.pending = None
+        self.geometry.pop(panel, None)
+        if panel in self.stack: self.stack.remove(panel)
+        button = self.minimized.pop(panel, None)
+        if button:
+            button.destroy()
+            self.layout_taskbar()
+
+    # --- Geometry ---
+    def place(self, panel):
+        x, y, w, h = self.geometry[panel]
+        panel.place(x=x, y=y, width=w, height=h)
+
+    def resize(self, panel, width, height):
+        self.geometry[panel][2:] = [width, height]
+        if panel in self.stack: self.place(panel)
+
+    def raise_panel(self, panel):
+        if self.stack and self.stack[-1] is panel:
+            return  # Already on top; lift would still restack and repaint
+        if panel in self.stack: self.stack.remove(panel)
+        self.stack.append(panel)
+        panel.lift()
+
+    # --- Dragging ---
+    def start_drag(self, panel, event):
+        self.raise_panel(panel)
+        x, y = self.geometry[panel][:2]
+        self.drag = (panel, event.x_root, event.y_root, x, y)
+
+    def drag_to(self, panel, event):
+        if not self.drag or self.drag[0] is not panel:
+            return
+        _, px, py, x, y = self.drag
+        self.pending = (panel, x + event.x_root - px, y + event.y_root - py)
+        if not self.job:
+            self.job = self.container.after(FRAME_MS, self.flush)
+
+    def end_drag(self, panel, event):
+        if self.job:
+            self.container.after_cancel(self.job)
+        self.flush()
+        self.drag = None
+
+    def flush(self):
+        self.job = None
+        if not self.pending:
+            return
+        panel, x, y = self.pending
+        self.pending = None
+        if panel not in self.geometry:
+            return
+        x, y = self.snap(panel, x, y)
+        geometry = self.geometry[panel]
+        if geometry[:2] != [x, y]:
+            geometry[:2] = [x, y]
+            panel.place(x=x, y=y)
+            self.places += 1
+
+    def snap(self, panel, x, y):
+        """Pulls the panel's edges onto the container edges or a nearby panel's edges"""
+        w, h = self.geometry[panel][2:]
+        xs, ys = [0, self.width], [0, self.height]
+        for other in self.stack:
+            if other is not panel:
+                ox, oy, ow, oh = self.geometry[other]
+                xs += [ox, ox + ow]
+                ys += [oy, oy + oh]
+        return self.nearest(x, w, xs), self.nearest(y, h, ys)
+
+    def nearest(self, start, size, lines):
+        best, best_gap = start, SNAP_PX + 1
+        for line in lines:
+            for edge, moved in ((start, line), (start + size, line - size)):
+                gap = abs(edge - line)
+                if gap < best_gap:
+                    best, best_gap = moved, gap
+        return best
+
+    # --- Visibility ---
+    def is_visible(self, panel):
+        return panel in self.stack
+
+    def show(self, panel):
+        button = self.minimized.pop(panel, None)
+        if button:
+            button.destroy()
+            self.layout_taskbar()
+        if panel not in self.stack:
+            self.place(panel)
+            notify(panel, True)
+        self.raise_panel(panel)
+
+    def hide(self, panel):
+        if panel in self.stack:
+            self.stack.remove(panel)
+            panel.place_forget()
+            notify(panel, False)
+
+    def toggle(self, panel):
+        if self.is_visible(panel): self.hide(panel)
+        else: self.show(panel)
+
+    def minimize(self, panel, label):
+        self.hide(panel)
+        if panel not in self.minimized:
+            self.minimized[panel] = tk.Button(self.get_taskbar(), text=label[:18], bg="#333", fg="white", bd=0,
+                                              padx=8, command=lambda: self.show(panel))
+            self.layout_taskbar()
+
+    def get_taskbar(self):
+        if not self.taskbar:
+            self.taskbar = tk.Frame(self.container, bg="#14182b")
+        return self.taskbar
+
+    def layout_taskbar(self):
+        for button in self.minimized.values():
+            button.pack_forget()
+            button.pack(side="left", fill="y", padx=1)
+        if self.minimized:
+            self.taskbar.place(x=0, y=self.height - TASKBAR_H, height=TASKBAR_H)
+            self.taskbar.lift()
+        elif self.taskbar:
+            self.taskbar.place_forget()
+
+def notify(panel, visible):
+    hook = getattr(panel, "set_visible", None)
+    if hook: hook(visible)